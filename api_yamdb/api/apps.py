@@ -1,5 +1,13 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
 
 
 class ApiConfig(AppConfig):
     name = 'api'
+
+    def ready(self):
+        from api_yamdb.db import check_connections, configure_sqlite
+
+        connection_created.connect(configure_sqlite)
+        request_started.connect(check_connections)
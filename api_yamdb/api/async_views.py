@@ -0,0 +1,46 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from api.inspector import inspect_queries
+from api.metrics import track_queries
+from api.views import CommentViewSet, ReviewViewSet, TitleViewSet
+
+# В Django 3.2 нет асинхронного ORM, а синхронные view под ASGI
+# выполняются в одном общем потоке. Здесь запросы к базе уходят в
+# отдельный пул: одновременно работают не больше ASYNC_DB_THREADS
+# потоков (и соединений с базой), а цикл событий в это время обслуживает
+# остальных клиентов.
+executor = ThreadPoolExecutor(
+    max_workers=settings.ASYNC_DB_THREADS, thread_name_prefix='async-db')
+
+
+def run_view(view, request, kwargs):
+    close_old_connections()
+    try:
+        with track_queries(), inspect_queries():
+            response = view(request, **kwargs)
+            response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+def async_view(view):
+    async def wrapper(request, **kwargs):
+        loop = asyncio.get_running_loop()
+        # run_in_executor не переносит contextvars в поток пула, а по ним
+        # метрики запроса находят, куда записывать время SQL.
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            executor, context.run, run_view, view, request, kwargs)
+    return wrapper
+
+
+title_list = async_view(TitleViewSet.as_view({'get': 'list'}))
+title_detail = async_view(TitleViewSet.as_view({'get': 'retrieve'}))
+review_list = async_view(ReviewViewSet.as_view({'get': 'list'}))
+comment_list = async_view(CommentViewSet.as_view({'get': 'list'}))
@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import F
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import User
+from reviews.user_cache import get_user_info
+
+# Только то, что нужно для проверки прав: смена этих полей отзывает
+# токены, поэтому username (его меняют через users/me/) сюда не входит.
+CLAIMS = ('role', 'is_superuser')
+VERSION_CLAIM = 'ver'
+
+
+def token_claims(user):
+    return {claim: getattr(user, claim) for claim in CLAIMS}
+
+
+def token_for_user(user):
+    token = AccessToken.for_user(user)
+    for claim, value in token_claims(user).items():
+        token[claim] = value
+    token[VERSION_CLAIM] = user.token_version
+    return token
+
+
+def get_token_version(user_id):
+    key = f'token-version:{user_id}'
+    version = cache.get(key)
+    if version is None:
+        version = User.objects.filter(pk=user_id, is_active=True).values_list(
+            'token_version', flat=True).first()
+        # Удалённый или неактивный пользователь: не подходит ни одна версия.
+        version = -1 if version is None else version
+        cache.set(key, version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def revoke_tokens(user_id):
+    User.objects.filter(pk=user_id).update(
+        token_version=F('token_version') + 1)
+    cache.delete(f'token-version:{user_id}')
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """Собирает пользователя из claims токена без запроса к users.
+
+    Остальные поля модели отложены и подгрузятся из базы при первом
+    обращении. Для токенов без claims (выпущенных AccessToken.for_user)
+    роль берётся из кэша пользователей.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Токен не содержит идентификатора пользователя.')
+        if VERSION_CLAIM not in validated_token:
+            info = get_user_info(user_id)
+            if info is None or not info.is_active:
+                raise AuthenticationFailed(
+                    'Пользователь не найден.', code='user_not_found')
+            return self.build_user(id=user_id, **info._asdict())
+        if validated_token[VERSION_CLAIM] != get_token_version(user_id):
+            raise AuthenticationFailed(
+                'Токен отозван.', code='token_revoked')
+        return self.build_user(
+            id=user_id,
+            is_active=True,
+            token_version=validated_token[VERSION_CLAIM],
+            **{claim: validated_token[claim] for claim in CLAIMS})
+
+    def build_user(self, **values):
+        fields = [field.attname for field in User._meta.concrete_fields
+                  if field.attname in values]
+        return User.from_db(
+            DEFAULT_DB_ALIAS, fields, [values[name] for name in fields])
@@ -0,0 +1,83 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE['ALIAS']]
+
+
+def get_timeout(namespace):
+    base = namespace.split(':', 1)[0]
+    return settings.RESPONSE_CACHE['TIMEOUTS'].get(
+        base, settings.RESPONSE_CACHE['TIMEOUT'])
+
+
+def get_version(namespace):
+    # Версия пространства имён входит в ключ: запись в нём делает все
+    # закэшированные ответы недостижимыми без перебора ключей. Версия —
+    # время последней записи в наносекундах, из неё же берётся
+    # Last-Modified.
+    cache = get_cache()
+    key = f'response-version:{namespace}'
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate(*namespaces):
+    version = time.time_ns()
+    get_cache().set_many({
+        f'response-version:{namespace}': version
+        for namespace in namespaces
+    }, None)
+
+
+def request_digest(request):
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    url = request.build_absolute_uri(request.path)
+    return hashlib.md5(
+        f'{url}?{query}:{request.accepted_renderer.format}'.encode()
+    ).hexdigest()
+
+
+def make_key(namespace, version, digest):
+    return f'response:{namespace}:{version}:{digest}'
+
+
+def make_validators(namespace, version, digest):
+    # Записи в обход API (админка, ORM) версию не меняют, поэтому
+    # валидаторы сменяются не реже раза в TTL, как и сам кэш ответов.
+    timeout = get_timeout(namespace)
+    window = int(time.time() // timeout)
+    etag = hashlib.md5(f'{version}:{window}:{digest}'.encode()).hexdigest()
+    last_modified = max(version // 10 ** 9, window * timeout)
+    return f'"{etag}"', last_modified
+
+
+def exact_validators(version, digest):
+    # Для версий, которые меняет любая запись, в том числе через ORM:
+    # валидаторы живут, пока не изменились данные.
+    etag = hashlib.md5(f'{version}:{digest}'.encode()).hexdigest()
+    return f'"{etag}"', version // 10 ** 9
+
+
+def record(namespace, hit):
+    base = namespace.split(':', 1)[0]
+    with _stats_lock:
+        _stats[base, 'hit' if hit else 'miss'] += 1
+
+
+def get_stats():
+    with _stats_lock:
+        return dict(_stats)
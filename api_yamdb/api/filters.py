@@ -1,6 +1,8 @@
 import django_filters
+from rest_framework import filters
 
 from reviews.models import Title
+from reviews.search import search_titles
 
 
 class GenreFilter(django_filters.FilterSet):
@@ -11,3 +13,10 @@ class GenreFilter(django_filters.FilterSet):
     class Meta:
         model = Title
         fields = ('genre', 'category', 'year', 'name')
+
+
+class TitleSearchFilter(filters.SearchFilter):
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, '')
+        return search_titles(queryset, term)
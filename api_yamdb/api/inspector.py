@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import re
+import time
+import traceback
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('api.queries')
+
+_current = ContextVar('query_log', default=None)
+_field = ContextVar('serializer_field', default=None)
+
+# Списки параметров IN (%s, %s, ...) разной длины — один и тот же запрос.
+PARAMS_LIST = re.compile(r'\(\s*%s(?:\s*,\s*%s)*\s*\)')
+SKIP_FILES = {str(Path(__file__).resolve()),
+              str(Path(__file__).with_name('metrics.py').resolve())}
+
+
+def fingerprint(sql):
+    return PARAMS_LIST.sub('(%s...)', sql)
+
+
+def stack_location():
+    # Ближайший к запросу кадр из кода проекта: файл, строка и функция.
+    base = str(settings.BASE_DIR)
+    for frame in reversed(traceback.extract_stack()):
+        if frame.filename.startswith(base) and (
+                frame.filename not in SKIP_FILES):
+            path = Path(frame.filename).relative_to(base)
+            return f'{path}:{frame.lineno} in {frame.name}'
+    return '-'
+
+
+class QueryLog:
+
+    def __init__(self, slow_query_ms):
+        self.slow_query_ms = slow_query_ms
+        self.queries = {}
+
+    def add(self, sql, duration):
+        key = fingerprint(sql)
+        entry = self.queries.get(key)
+        if entry is None:
+            entry = self.queries[key] = {
+                'count': 0, 'duration': 0.0,
+                'field': _field.get(), 'location': stack_location(),
+            }
+        entry['count'] += 1
+        entry['duration'] += duration
+        if duration * 1000 >= self.slow_query_ms:
+            logger.warning(
+                'Медленный запрос %.1f мс (поле %s, %s): %s',
+                duration * 1000, _field.get() or '-', stack_location(), sql)
+
+    def repeated(self, threshold):
+        return [
+            (key, entry) for key, entry in self.queries.items()
+            if entry['count'] >= threshold
+        ]
+
+
+@contextmanager
+def inspect_queries():
+    if _current.get() is None:
+        yield
+        return
+    with ExitStack() as stack:
+        for connection in connections.all():
+            if log_query not in connection.execute_wrappers:
+                stack.enter_context(connection.execute_wrapper(log_query))
+        yield
+
+
+def log_query(execute, sql, params, many, context):
+    # Журнал берётся из контекста на каждом запросе, как в
+    # api.metrics.record_query.
+    log = _current.get()
+    if log is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        log.add(sql, time.perf_counter() - started)
+
+
+def watch_connections():
+    for connection in connections.all():
+        if log_query not in connection.execute_wrappers:
+            connection.execute_wrappers.append(log_query)
+
+
+def track_fields(serializer, fields):
+    # Пока сериализатор обрабатывает поле, его имя лежит в контексте:
+    # ленивые запросы из get_attribute (N+1 без select_related или
+    # prefetch_related) записываются на это поле.
+    name = type(serializer).__name__
+    for field in fields:
+        token = _field.set(f'{name}.{field.field_name}')
+        try:
+            yield field
+        finally:
+            _field.reset(token)
+
+
+def readable_fields(serializer, fields):
+    if _current.get() is None:
+        return fields
+    return track_fields(serializer, fields)
+
+
+class QueryInspectorMiddleware:
+    # Отладочный режим для dev/staging: повторяющиеся в одном запросе
+    # одинаковые SQL-запросы (N+1) и медленные запросы пишутся в лог
+    # api.queries вместе с полем сериализатора и местом в коде.
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        config = settings.QUERY_INSPECTOR
+        if not config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_query_ms = config['SLOW_QUERY_MS']
+        self.repeat_threshold = config['REPEAT_THRESHOLD']
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self):
+            return self.__acall__(request)
+        log = QueryLog(self.slow_query_ms)
+        token = _current.set(log)
+        try:
+            with inspect_queries():
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.report(request, log)
+        return response
+
+    async def __acall__(self, request):
+        log = QueryLog(self.slow_query_ms)
+        token = _current.set(log)
+        try:
+            await sync_to_async(watch_connections)()
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.report(request, log)
+        return response
+
+    def report(self, request, log):
+        for sql, entry in log.repeated(self.repeat_threshold):
+            logger.warning(
+                'Повторяющийся запрос (N+1) x%d, %.1f мс, %s %s '
+                '(поле %s, %s): %s',
+                entry['count'], entry['duration'] * 1000, request.method,
+                request.path, entry['field'] or '-', entry['location'], sql)
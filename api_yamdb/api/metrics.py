@@ -0,0 +1,225 @@
+import asyncio
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from api import cache
+
+_current = ContextVar('request_metrics', default=None)
+_histograms = {}
+_lock = threading.Lock()
+
+METRICS = (
+    ('request_duration_seconds', 'total', 'Время обработки запроса.'),
+    ('request_sql_duration_seconds', 'sql',
+     'Суммарное время SQL-запросов за запрос.'),
+    ('request_serializer_duration_seconds', 'serializer',
+     'Время работы сериализаторов за запрос.'),
+    ('request_queries', 'queries', 'Число SQL-запросов за запрос.'),
+)
+
+
+class RequestMetrics:
+    __slots__ = ('queries', 'sql', 'serializer', 'total')
+
+    def __init__(self):
+        self.queries = 0
+        self.sql = self.serializer = self.total = 0.0
+
+    def server_timing(self):
+        return ', '.join((
+            f'db;dur={self.sql * 1000:.1f};desc="{self.queries} queries"',
+            f'serializer;dur={self.serializer * 1000:.1f}',
+            f'total;dur={self.total * 1000:.1f}',
+        ))
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'sum')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+
+    def observe(self, value):
+        # Границы корзин в Prometheus включительные (le): значение,
+        # равное границе, попадает в эту корзину.
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+def get_buckets(field):
+    config = settings.REQUEST_METRICS
+    return config['QUERY_BUCKETS' if field == 'queries' else 'BUCKETS']
+
+
+def observe(view, method, metrics):
+    with _lock:
+        for _, field, _ in METRICS:
+            key = (field, view, method)
+            histogram = _histograms.get(key)
+            if histogram is None:
+                histogram = _histograms[key] = Histogram(get_buckets(field))
+            histogram.observe(getattr(metrics, field))
+
+
+def clear_metrics():
+    with _lock:
+        _histograms.clear()
+
+
+@contextmanager
+def measure(field):
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(metrics, field,
+                getattr(metrics, field) + time.perf_counter() - started)
+
+
+@contextmanager
+def track_queries():
+    # execute_wrapper ставится на соединения текущего потока, поэтому
+    # асинхронные view вызывают его и в потоке пула.
+    if _current.get() is None:
+        yield
+        return
+    with ExitStack() as stack:
+        for connection in connections.all():
+            if record_query not in connection.execute_wrappers:
+                stack.enter_context(connection.execute_wrapper(record_query))
+        yield
+
+
+def record_query(execute, sql, params, many, context):
+    # Запрос находится по контексту в момент выполнения: одна обёртка
+    # обслуживает и соединения, общие для нескольких запросов.
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.sql += time.perf_counter() - started
+
+
+def watch_connections():
+    # Под ASGI синхронные view выполняются в общем для всех запросов
+    # потоке (sync_to_async(thread_sensitive=True)): обёртка ставится
+    # туда насовсем, контекст запроса sync_to_async переносит сам.
+    for connection in connections.all():
+        if record_query not in connection.execute_wrappers:
+            connection.execute_wrappers.append(record_query)
+
+
+def escape(value):
+    return (str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_histograms(snapshot, name, field, description):
+    yield f'# HELP yamdb_{name} {description}'
+    yield f'# TYPE yamdb_{name} histogram'
+    for (_, view, method), (buckets, counts, value) in sorted(
+            item for item in snapshot.items() if item[0][0] == field):
+        labels = f'view="{escape(view)}",method="{escape(method)}"'
+        total = 0
+        for bound, count in zip(buckets, counts):
+            total += count
+            yield f'yamdb_{name}_bucket{{{labels},le="{bound}"}} {total}'
+        total += counts[-1]
+        yield f'yamdb_{name}_bucket{{{labels},le="+Inf"}} {total}'
+        yield f'yamdb_{name}_sum{{{labels}}} {format_value(value)}'
+        yield f'yamdb_{name}_count{{{labels}}} {total}'
+
+
+def render_metrics():
+    with _lock:
+        snapshot = {
+            key: (histogram.buckets, list(histogram.counts), histogram.sum)
+            for key, histogram in _histograms.items()
+        }
+    lines = []
+    for name, field, description in METRICS:
+        lines.extend(render_histograms(snapshot, name, field, description))
+    lines.append('# HELP yamdb_response_cache_total '
+                 'Обращения к кэшу ответов.')
+    lines.append('# TYPE yamdb_response_cache_total counter')
+    for (namespace, result), count in sorted(cache.get_stats().items()):
+        lines.append(
+            f'yamdb_response_cache_total{{namespace="{escape(namespace)}",'
+            f'result="{result}"}} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+def view_name(request):
+    match = request.resolver_match
+    if match is None or not match.url_name:
+        return 'unresolved'
+    return match.url_name
+
+
+class MetricsMiddleware:
+    # Стоит первым в MIDDLEWARE: время total включает все остальные
+    # middleware. Имя view берётся из маршрута (titles-list,
+    # reviews-detail), а не из пути, чтобы число серий не росло с
+    # числом объектов.
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            with track_queries():
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, started)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            await sync_to_async(watch_connections)()
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, started)
+
+    def finish(self, request, response, metrics, started):
+        metrics.total = time.perf_counter() - started
+        observe(view_name(request), request.method, metrics)
+        response['Server-Timing'] = metrics.server_timing()
+        return response
@@ -1,9 +1,127 @@
-from rest_framework import filters, mixins, viewsets
+import json
 
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import filters, mixins, status, viewsets
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from api import cache
 from api.permissions import IsAdmin, ReadOnly
 
 
-class CreateListDestroyViewSet(mixins.CreateModelMixin,
+class CachedListMixin:
+    cache_namespace = None
+    invalidates = ()
+
+    def get_cache_namespace(self):
+        return self.cache_namespace
+
+    def get_cache_version(self, namespace):
+        return cache.get_version(namespace)
+
+    def get_validators(self, namespace, version, digest):
+        return cache.make_validators(namespace, version, digest)
+
+    def get_invalidated_namespaces(self):
+        return (self.get_cache_namespace(), *self.invalidates)
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        namespace = self.get_cache_namespace()
+        version = self.get_cache_version(namespace)
+        digest = cache.request_digest(request)
+        etag, last_modified = self.get_validators(namespace, version, digest)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified)
+        if response is None:
+            if request.user.is_authenticated:
+                response = handler(request, *args, **kwargs)
+            else:
+                response = self.anonymous_response(
+                    cache.make_key(namespace, version, digest),
+                    namespace, handler, request, *args, **kwargs)
+        if response.status_code in (status.HTTP_200_OK,
+                                    status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def anonymous_response(self, key, namespace, handler, request,
+                           *args, **kwargs):
+        data = cache.get_cache().get(key)
+        cache.record(namespace, hit=data is not None)
+        if data is not None:
+            return Response(data)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.get_cache().set(
+                key, response.data, cache.get_timeout(namespace))
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if (request.method not in SAFE_METHODS
+                and status.is_success(response.status_code)):
+            cache.invalidate(*self.get_invalidated_namespaces())
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class CachedListRetrieveMixin(CachedListMixin):
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs)
+
+
+class ValuesListMixin:
+    # Для справочников из пары полей список собирается из values() и
+    # сразу кодируется в JSON, без моделей и сериализатора. Готовые байты
+    # кэшируются под версией пространства имён — и для анонимных, и для
+    # авторизованных запросов: создание и удаление меняют версию.
+    # Остальные форматы (browsable API) идут обычным путём.
+    list_fields = ()
+
+    def list(self, request, *args, **kwargs):
+        if request.accepted_renderer.format != 'json':
+            return super().list(request, *args, **kwargs)
+        return self.cached_response(self.rendered_list, request)
+
+    def anonymous_response(self, key, namespace, handler, request,
+                           *args, **kwargs):
+        if handler == self.rendered_list:
+            return handler(request)
+        return super().anonymous_response(
+            key, namespace, handler, request, *args, **kwargs)
+
+    def rendered_list(self, request):
+        namespace = self.get_cache_namespace()
+        key = cache.make_key(
+            namespace, cache.get_version(namespace),
+            cache.request_digest(request))
+        content = cache.get_cache().get(key)
+        cache.record(namespace, hit=content is not None)
+        if content is None:
+            content = json.dumps(
+                self.list_data(), ensure_ascii=False, separators=(',', ':')
+            ).encode()
+            cache.get_cache().set(key, content, cache.get_timeout(namespace))
+        return HttpResponse(content, content_type='application/json')
+
+    def list_data(self):
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            *self.list_fields)
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return list(queryset)
+        return self.get_paginated_response(page).data
+
+
+class CreateListDestroyViewSet(ValuesListMixin,
+                               CachedListMixin,
+                               mixins.CreateModelMixin,
                                mixins.DestroyModelMixin,
                                mixins.ListModelMixin,
                                viewsets.GenericViewSet):
@@ -11,3 +129,5 @@ class CreateListDestroyViewSet(mixins.CreateModelMixin,
     lookup_field = 'slug'
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
+    invalidates = ('titles',)
+    list_fields = ('name', 'slug')
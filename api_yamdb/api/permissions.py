@@ -44,6 +44,6 @@ class IsUser(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         user = request.user
         return (request.method in SAFE_METHODS
-                or obj.author == user
+                or obj.author_id == user.pk
                 or user.is_moderator
                 or user.is_admin)
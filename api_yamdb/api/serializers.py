@@ -1,10 +1,78 @@
+import copy
 import re
 
-from django.shortcuts import get_object_or_404
+from django.conf import settings
 from django.utils import timezone
+from django.utils.functional import cached_property
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
+from api.inspector import readable_fields
+from api.metrics import measure
+from reviews.bulk import create_titles
 from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.user_cache import get_user_info
+
+
+class AuthorField(serializers.SlugRelatedField):
+    # Автор берётся из загруженного объекта, а если его нет — из кэша
+    # пользователей по author_id, без запроса на каждую строку.
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('slug_field', 'username')
+        kwargs.setdefault('read_only', True)
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        field = instance._meta.get_field(self.source)
+        if field.is_cached(instance):
+            return getattr(instance, self.source)
+        return get_user_info(getattr(instance, field.attname))
+
+    def to_representation(self, obj):
+        return getattr(obj, self.slug_field)
+
+
+class TimedListSerializer(serializers.ListSerializer):
+
+    @property
+    def data(self):
+        with measure('serializer'):
+            return super().data
+
+
+class BaseModelSerializer(serializers.ModelSerializer):
+    # Время сериализации попадает в метрики запроса. Вложенные
+    # сериализаторы вызываются через to_representation и отдельно не
+    # замеряются; для списков Meta задаёт TimedListSerializer.
+    #
+    # ModelSerializer.get_fields заново разбирает _meta модели для
+    # каждого экземпляра, хотя поля зависят только от класса и Meta:
+    # здесь они строятся один раз на класс, а экземпляр получает копии.
+    # Поля не должны зависеть от контекста или instance.
+    _fields_cache = {}
+
+    @property
+    def data(self):
+        with measure('serializer'):
+            return super().data
+
+    def get_fields(self):
+        fields = self._fields_cache.get(type(self))
+        if fields is None:
+            fields = self._fields_cache.setdefault(
+                type(self), super().get_fields())
+        return copy.deepcopy(fields)
+
+    @cached_property
+    def _readable_field_list(self):
+        return [
+            field for field in self.fields.values() if not field.write_only
+        ]
+
+    @property
+    def _readable_fields(self):
+        return readable_fields(self, self._readable_field_list)
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -51,23 +119,25 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(BaseModelSerializer):
 
     class Meta:
         model = Category
         exclude = ['id']
         lookup_field = 'slug'
+        list_serializer_class = TimedListSerializer
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(BaseModelSerializer):
 
     class Meta:
         model = Genre
         exclude = ['id']
         lookup_field = 'slug'
+        list_serializer_class = TimedListSerializer
 
 
-class TitleGetSerializer(serializers.ModelSerializer):
+class TitleGetSerializer(BaseModelSerializer):
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(read_only=True, many=True)
     description = serializers.CharField(required=False)
@@ -78,6 +148,7 @@ class TitleGetSerializer(serializers.ModelSerializer):
         fields = ('id', 'name', 'description', 'category',
                   'genre', 'year', 'rating')
         read_only_fields = ('__all__',)
+        list_serializer_class = TimedListSerializer
 
 
 class TitlePostSerializer(serializers.ModelSerializer):
@@ -109,7 +180,71 @@ class TitlePostSerializer(serializers.ModelSerializer):
         return value
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class TitleBulkListSerializer(serializers.ListSerializer):
+    # Ошибки возвращаются списком той же длины, что и запрос: пустой
+    # словарь — у элемента ошибок нет. Слаги проверяются одним запросом
+    # на модель для всей пачки.
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list) or not data:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Ожидается непустой список произведений.']
+            })
+        if len(data) > settings.TITLES_BULK_MAX_ITEMS:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'За один запрос можно создать не больше '
+                    f'{settings.TITLES_BULK_MAX_ITEMS} произведений.']
+            })
+        items, errors = [], []
+        for item in data:
+            try:
+                items.append(self.child.run_validation(item))
+                errors.append({})
+            except serializers.ValidationError as exc:
+                items.append(None)
+                errors.append(exc.detail)
+        self.resolve_slugs(items, errors)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return items
+
+    def resolve_slugs(self, items, errors):
+        valid = [item for item in items if item is not None]
+        categories = dict(Category.objects.filter(
+            slug__in={item['category'] for item in valid}
+        ).values_list('slug', 'pk'))
+        genres = dict(Genre.objects.filter(
+            slug__in={slug for item in valid for slug in item['genre']}
+        ).values_list('slug', 'pk'))
+        for item, error in zip(items, errors):
+            if item is None:
+                continue
+            if item['category'] not in categories:
+                error['category'] = [
+                    f'Категория {item["category"]} не найдена.']
+            missing = [slug for slug in item['genre'] if slug not in genres]
+            if missing:
+                error['genre'] = [
+                    f'Жанр {slug} не найден.' for slug in missing]
+            item['category_id'] = categories.get(item['category'])
+            item['genre_ids'] = list(dict.fromkeys(
+                genres.get(slug) for slug in item['genre']))
+
+    def create(self, validated_data):
+        return create_titles(validated_data)
+
+
+class TitleBulkSerializer(TitlePostSerializer):
+    category = serializers.SlugField()
+    genre = serializers.ListField(child=serializers.SlugField())
+
+    class Meta(TitlePostSerializer.Meta):
+        list_serializer_class = TitleBulkListSerializer
+
+
+class ReviewSerializer(BaseModelSerializer):
     text = serializers.CharField(
         required=True
     )
@@ -119,21 +254,7 @@ class ReviewSerializer(serializers.ModelSerializer):
     pub_date = serializers.DateField(
         read_only=True
     )
-    author = serializers.SlugRelatedField(
-        slug_field='username',
-        read_only=True
-    )
-
-    def validate(self, attrs):
-        title_id = self.context.get('view').kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
-        author = self.context['request'].user
-        if (self.context['request'].method == 'POST'
-                and Review.objects.filter(
-                title=title, author=author).exists()):
-            raise serializers.ValidationError(
-                'You cant create one more review')
-        return attrs
+    author = AuthorField()
 
     def validate_score(self, score):
         if score < 1 or score > 10:
@@ -143,23 +264,22 @@ class ReviewSerializer(serializers.ModelSerializer):
     class Meta:
         model = Review
         fields = ('id', 'text', 'author', 'score', 'pub_date')
+        list_serializer_class = TimedListSerializer
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(BaseModelSerializer):
     text = serializers.CharField(
         required=True
     )
     pub_date = serializers.DateField(
         read_only=True
     )
-    author = serializers.SlugRelatedField(
-        slug_field='username',
-        read_only=True
-    )
+    author = AuthorField()
 
     class Meta:
         model = Comment
         fields = ('__all__')
+        list_serializer_class = TimedListSerializer
 
 
 class TokenRegSerializer(serializers.Serializer):
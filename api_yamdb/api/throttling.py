@@ -0,0 +1,97 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    # Скользящее окно из двух счётчиков: текущего и предыдущего окна,
+    # взвешенного по тому, какая его часть ещё попадает в последние
+    # duration секунд. Проверка — один get_many и по одному incr на ключ,
+    # без списков отметок времени и без запросов к базе. Ключи строятся
+    # по IP и по полям запроса (fields), поэтому смена IP не обходит
+    # лимит на username или email.
+    fields = ()
+
+    def __init__(self):
+        self.cache = caches[settings.THROTTLE_CACHE]
+        super().__init__()
+
+    def get_rate(self):
+        # THROTTLE_RATES класса фиксируется при импорте, а настройки
+        # читаются при каждом запросе, чтобы их можно было переопределить.
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_idents(self, request):
+        yield 'ip', str(self.get_ident(request))
+        data = request.data if isinstance(request.data, dict) else {}
+        for field in self.fields:
+            value = data.get(field)
+            if isinstance(value, str) and value:
+                yield field, value.strip().lower()
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.elapsed = self.now / self.duration - window
+        prefixes = [
+            f'throttle:{self.scope}:{kind}:'
+            f'{hashlib.md5(ident.encode()).hexdigest()}'
+            for kind, ident in self.get_idents(request)
+        ]
+        keys = [
+            (f'{prefix}:{window - 1}', f'{prefix}:{window}')
+            for prefix in prefixes
+        ]
+        counts = self.cache.get_many(
+            [key for pair in keys for key in pair])
+        self.counts = [
+            (counts.get(previous, 0), counts.get(current, 0))
+            for previous, current in keys
+        ]
+        if any(self.estimate(previous, current) >= self.num_requests
+               for previous, current in self.counts):
+            return False
+        for _, current in keys:
+            self.increment(current)
+        return True
+
+    def estimate(self, previous, current):
+        return previous * (1 - self.elapsed) + current
+
+    def increment(self, key):
+        # Счётчик живёт два окна: в следующем он становится предыдущим.
+        self.cache.add(key, 0, 2 * self.duration)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, 1, 2 * self.duration)
+
+    def wait(self):
+        # Через сколько секунд оценка опустится ниже лимита по самому
+        # загруженному ключу.
+        waits = []
+        for previous, current in self.counts:
+            if self.estimate(previous, current) < self.num_requests:
+                continue
+            if current < self.num_requests:
+                fraction = 1 - (self.num_requests - current) / previous
+                waits.append(fraction - self.elapsed)
+            else:
+                fraction = 1 - self.num_requests / current
+                waits.append(1 - self.elapsed + fraction)
+        return int(max(waits, default=0) * self.duration) + 1
+
+
+class SignupThrottle(SlidingWindowThrottle):
+    scope = 'signup'
+    fields = ('username', 'email')
+
+
+class TokenThrottle(SlidingWindowThrottle):
+    scope = 'token'
+    fields = ('username',)
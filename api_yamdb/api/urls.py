@@ -1,9 +1,10 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter, SimpleRouter
 
+from api import async_views
 from api.views import (CRUDUser, CategoryViewSet, CommentViewSet,
-                       GenreViewSet, ReviewViewSet, SendCodeView,
-                       SendTokenView, TitleViewSet)
+                       ExportView, GenreViewSet, MetricsView, ReviewViewSet,
+                       SendCodeView, SendTokenView, TitleViewSet)
 
 router = SimpleRouter()
 router_v1 = DefaultRouter()
@@ -21,5 +22,15 @@ router_v1.register(
 urlpatterns = [
     path('v1/auth/signup/', SendCodeView.as_view(), name='send_confcode'),
     path('v1/auth/token/', SendTokenView.as_view(), name='send_token'),
+    path('v1/export/', ExportView.as_view(), name='export'),
+    path('v1/_metrics/', MetricsView.as_view(), name='metrics'),
+    path('v1/async/titles/', async_views.title_list,
+         name='async-titles-list'),
+    path('v1/async/titles/<int:pk>/', async_views.title_detail,
+         name='async-titles-detail'),
+    path('v1/async/titles/<int:title_id>/reviews/', async_views.review_list,
+         name='async-reviews-list'),
+    path('v1/async/titles/<int:title_id>/reviews/<int:review_id>/comments/',
+         async_views.comment_list, name='async-comments-list'),
     path('v1/', include(router_v1.urls))
 ]
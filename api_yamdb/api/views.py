@@ -1,25 +1,38 @@
-import shortuuid
-
-from django.core.mail import send_mail
+from django.db import IntegrityError, transaction
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_date
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Avg
 from rest_framework import filters, permissions, status, viewsets
 from rest_framework.decorators import permission_classes, action
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import AccessToken
 
-from api.filters import GenreFilter
+from api import cache
+from api.authentication import revoke_tokens, token_claims, token_for_user
+from api.filters import GenreFilter, TitleSearchFilter
+from api.metrics import render_metrics
+from api.pagination import PageNumberOrKeysetPagination
 from api.permissions import (IsAdmin, IsUser, ReadOnly, AdminPermission,
                              MePermission)
+from reviews.confirmation import check_code, issue_code
+from reviews.export import export_records, ndjson_lines
+from reviews.facets import filtered_facets, stored_facets
 from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.outbox import queue_mail
+from reviews.ratings import change_rating
+from reviews.title_versions import (get_title_version,
+                                    remember_title_version)
+from api.throttling import SignupThrottle, TokenThrottle
 from api.serializers import (CategorySerializer, CommentSerializer,
                              GenreSerializer, ReviewSerializer,
-                             TitleGetSerializer, TitlePostSerializer,
-                             TokenRegSerializer, UserSerializer)
-from api.mixins import CreateListDestroyViewSet
+                             TitleBulkSerializer, TitleGetSerializer,
+                             TitlePostSerializer, TokenRegSerializer,
+                             UserSerializer)
+from api.mixins import CachedListRetrieveMixin, CreateListDestroyViewSet
 from api_yamdb.settings import FROM_MAIL, THEME_MAIL
 
 
@@ -28,59 +41,185 @@ class CategoryViewSet(CreateListDestroyViewSet):
     serializer_class = CategorySerializer
     pagination_class = PageNumberPagination
     permission_classes = [IsAdmin | ReadOnly]
+    cache_namespace = 'categories'
 
 
 class GenreViewSet(CreateListDestroyViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_namespace = 'genres'
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.all().annotate(rating=Avg('reviews__score'))
+class TitleViewSet(CachedListRetrieveMixin, viewsets.ModelViewSet):
+    queryset = Title.objects.select_related(
+        'category').prefetch_related('genre')
     ordering_fields = ('year', 'name')
     permission_classes = [IsAdmin | ReadOnly]
-    filter_backends = (DjangoFilterBackend, filters.SearchFilter,)
+    filter_backends = (DjangoFilterBackend, TitleSearchFilter,)
     filterset_class = GenreFilter
+    cache_namespace = 'titles'
+
+    def get_cache_namespace(self):
+        # Карточка версионируется по самому произведению: отзывы к другим
+        # произведениям и правки справочников её ETag не меняют.
+        if self.action == 'retrieve':
+            return f'title:{self.kwargs["pk"]}'
+        return 'titles'
+
+    def get_cache_version(self, namespace):
+        if self.action != 'retrieve':
+            return super().get_cache_version(namespace)
+        version = get_title_version(self.kwargs['pk'])
+        if version is None:
+            # Промах: версию даёт сама запись, которую всё равно
+            # загрузит retrieve.
+            version = remember_title_version(self.get_object())
+        return version
+
+    def get_validators(self, namespace, version, digest):
+        if self.action == 'retrieve':
+            return cache.exact_validators(version, digest)
+        return super().get_validators(namespace, version, digest)
+
+    def get_object(self):
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
+
+    def get_invalidated_namespaces(self):
+        namespaces = ['titles']
+        if 'pk' in self.kwargs:
+            namespaces.append(f'reviews:{self.kwargs["pk"]}')
+        return namespaces
 
     def get_serializer_class(self):
         if self.action == 'list' or self.action == 'retrieve':
             return TitleGetSerializer
         return TitlePostSerializer
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        serializer = TitleBulkSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        titles = serializer.save()
+        return Response(TitleGetSerializer(titles, many=True).data,
+                        status=status.HTTP_201_CREATED)
+
+    @action(detail=False)
+    def facets(self, request):
+        return self.cached_response(self.facet_counts, request)
 
-class ReviewViewSet(viewsets.ModelViewSet):
+    def facet_counts(self, request):
+        params = (*GenreFilter.base_filters, TitleSearchFilter.search_param)
+        if any(request.query_params.get(param) for param in params):
+            queryset = self.filter_queryset(self.get_queryset())
+            return Response(filtered_facets(queryset))
+        return Response(stored_facets())
+
+
+class ReviewViewSet(CachedListRetrieveMixin, viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = [IsUser]
+    pagination_class = PageNumberOrKeysetPagination
+    only_fields = ('id', 'title', 'text', 'score', 'pub_date',
+                   'author', 'author__username')
+
+    def get_cache_namespace(self):
+        return f'reviews:{self.kwargs["title_id"]}'
+
+    def get_invalidated_namespaces(self):
+        # Оценка отзыва входит в рейтинг, который отдают списки произведений.
+        namespaces = [self.get_cache_namespace(), 'titles']
+        if 'pk' in self.kwargs:
+            namespaces.append(f'comments:{self.kwargs["pk"]}')
+        return namespaces
+
+    def get_title(self):
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(Title, pk=self.kwargs['title_id'])
+        return self._title
 
     def get_queryset(self):
-        title_id = self.kwargs['title_id']
-        title = get_object_or_404(Title, pk=title_id)
-        return title.reviews.all()
+        if self.detail:
+            # Отзыв ищется сразу по паре (title_id, pk): отдельная
+            # проверка произведения не нужна.
+            queryset = Review.objects.filter(
+                title_id=self.kwargs['title_id'])
+        else:
+            queryset = self.get_title().reviews.all()
+        return queryset.select_related('author').only(*self.only_fields)
 
     def perform_create(self, serializer):
-        title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        serializer.save(author=self.request.user, title=title)
+        title = self.get_title()
+        try:
+            with transaction.atomic():
+                review = serializer.save(author=self.request.user,
+                                         title=title)
+                change_rating(review.title_id, review.score, 1)
+        except IntegrityError:
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'You cant create one more review']
+            })
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        # Старая оценка перечитывается под блокировкой: загруженная до
+        # транзакции могла уже измениться параллельным запросом.
+        try:
+            old_score = Review.objects.select_for_update().values_list(
+                'score', flat=True).get(pk=serializer.instance.pk)
+        except Review.DoesNotExist:
+            raise Http404
+        review = serializer.save()
+        change_rating(review.title_id, review.score - old_score)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        # Рейтинг меняет только тот запрос, который действительно удалил
+        # отзыв, а не каждый из параллельных DELETE.
+        reviews = Review.objects.filter(pk=instance.pk)
+        score = reviews.select_for_update().values_list(
+            'score', flat=True).first()
+        deleted, _ = reviews.delete()
+        if deleted:
+            change_rating(instance.title_id, -score, -1)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(CachedListRetrieveMixin, viewsets.ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = [IsUser]
+    pagination_class = PageNumberOrKeysetPagination
+    only_fields = ('id', 'review', 'text', 'pub_date',
+                   'author', 'author__username')
+
+    def get_cache_namespace(self):
+        return f'comments:{self.kwargs["review_id"]}'
+
+    def get_review(self):
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review,
+                pk=self.kwargs['review_id'],
+                title_id=self.kwargs['title_id'])
+        return self._review
 
     def get_queryset(self):
-        title_id = self.kwargs['title_id']
-        get_object_or_404(Title, pk=title_id)
-        review_id = self.kwargs['review_id']
-        get_object_or_404(Review, pk=review_id)
-        return Comment.objects.filter(review=review_id)
+        if self.detail:
+            queryset = Comment.objects.filter(
+                review_id=self.kwargs['review_id'],
+                review__title_id=self.kwargs['title_id'])
+        else:
+            queryset = self.get_review().comments.all()
+        return queryset.select_related('author').only(*self.only_fields)
 
     def perform_create(self, serializer):
-        get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        review = get_object_or_404(Review, id=self.kwargs.get('review_id'))
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.get_review())
 
 
 class SendCodeView(APIView):
     permission_classes = (permissions.AllowAny,)
+    throttle_classes = (SignupThrottle,)
     serializer_class = UserSerializer
 
     def post(self, request):
@@ -89,20 +228,18 @@ class SendCodeView(APIView):
 
         email = serializer.validated_data.get('email')
         username = serializer.validated_data.get('username')
-        confirmation_code = shortuuid.uuid()[:6]
         user, user_created = User.objects.update_or_create(
             username=username,
             defaults={
                 'username': username,
-                'email': email,
-                'confirmation_code': confirmation_code}
+                'email': email}
         )
-        send_mail(
+        confirmation_code = issue_code(user)
+        queue_mail(
             THEME_MAIL,
             f'Ваш код подтверждения: {confirmation_code}',
             FROM_MAIL,
             [email],
-            fail_silently=False,
         )
         return Response(
             {'username': username, 'email': email},
@@ -112,23 +249,53 @@ class SendCodeView(APIView):
 
 @permission_classes([permissions.AllowAny])
 class SendTokenView(APIView):
+    throttle_classes = (TokenThrottle,)
+
     def post(self, request, *args, **kwargs):
         serializer = TokenRegSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         confirmation_code = serializer.validated_data.get('confirmation_code')
         username = serializer.validated_data.get('username')
-        code_exist = User.objects.filter(
-            confirmation_code=confirmation_code).exists()
-        user = get_object_or_404(User, username=username)
-        if not code_exist:
+        user = get_object_or_404(
+            User.objects.select_related('confirmation'), username=username)
+        if not check_code(user, confirmation_code):
             return Response({
                 'error': 'Введен неверный код подтверждения!'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        token = AccessToken.for_user(user)
+        token = token_for_user(user)
         return Response({'token': str(token)}, status=status.HTTP_200_OK)
 
 
+class ExportView(APIView):
+    permission_classes = [AdminPermission, permissions.IsAuthenticated]
+
+    def get(self, request):
+        since = request.query_params.get('since')
+        if since is not None:
+            since = parse_date(since)
+            if since is None:
+                return Response(
+                    {'since': ['Укажите дату в формате ГГГГ-ММ-ДД.']},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        response = StreamingHttpResponse(
+            ndjson_lines(export_records(since)),
+            content_type='application/x-ndjson')
+        response['Content-Disposition'] = (
+            'attachment; filename="yamdb.ndjson"')
+        return response
+
+
+class MetricsView(APIView):
+    permission_classes = [AdminPermission, permissions.IsAuthenticated]
+
+    def get(self, request):
+        return HttpResponse(
+            render_metrics(),
+            content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 class CRUDUser(viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
@@ -138,17 +305,35 @@ class CRUDUser(viewsets.ModelViewSet):
     search_fields = ('username',)
     http_method_names = ['get', 'post', 'patch', 'delete', ]
 
+    def save_user(self, serializer):
+        # Роль и username зашиты в выданные токены: после их смены
+        # старые токены отзываются.
+        claims = token_claims(serializer.instance)
+        user = serializer.save()
+        if token_claims(user) != claims:
+            revoke_tokens(user.pk)
+
+    def perform_update(self, serializer):
+        self.save_user(serializer)
+
+    def perform_destroy(self, instance):
+        user_id = instance.pk
+        instance.delete()
+        revoke_tokens(user_id)
+
     @action(
         detail=False,
         methods=['get', 'patch'],
         permission_classes=[MePermission, permissions.IsAuthenticated])
     def me(self, request):
+        # request.user может быть собран из токена с отложенными полями,
+        # поэтому профиль читается из базы целиком.
+        user = get_object_or_404(User, pk=request.user.pk)
         if request.method == 'PATCH':
             serializer = UserSerializer(
-                request.user, data=request.data, partial=True)
+                user, data=request.data, partial=True)
             serializer.is_valid(raise_exception=True)
-            serializer.save()
+            self.save_user(serializer)
             return Response(serializer.data, status=status.HTTP_200_OK)
-        user = get_object_or_404(User, username=request.user.username)
         serializer = UserSerializer(user, partial=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.db import connections
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    # WAL даёт читать во время записи, а busy_timeout заставляет писателя
+    # ждать блокировку вместо немедленного «database is locked».
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def check_connections(**kwargs):
+    # В Django 3.2 нет CONN_HEALTH_CHECKS: постоянное соединение, которое
+    # закрыл сервер или пулер, проверяется в начале запроса и
+    # переоткрывается, а не роняет первый запрос к базе.
+    if not settings.DB_HEALTH_CHECKS:
+        return
+    for connection in connections.all():
+        if (connection.connection is not None
+                and connection.settings_dict['CONN_MAX_AGE']
+                and not connection.in_atomic_block
+                and not connection.is_usable()):
+            connection.close()
@@ -27,6 +27,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.metrics.MetricsMiddleware',
+    'api.inspector.QueryInspectorMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -58,13 +60,78 @@ TEMPLATES = [
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 
-DATABASES = {
+# DB_ENGINE=postgresql переключает проект на PostgreSQL; по умолчанию
+# используется SQLite-файл рядом с manage.py.
+if os.getenv('DB_ENGINE', 'sqlite') == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('POSTGRES_DB', 'yamdb'),
+            'USER': os.getenv('POSTGRES_USER', 'postgres'),
+            'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            # Соединение живёт между запросами, а не открывается заново.
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+            # За pgbouncer в режиме transaction серверные курсоры
+            # (QuerySet.iterator) не работают.
+            'DISABLE_SERVER_SIDE_CURSORS': os.getenv(
+                'DB_DISABLE_SERVER_SIDE_CURSORS', 'False') == 'True',
+            'OPTIONS': {
+                'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', 5)),
+            },
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv(
+                'SQLITE_PATH', str(os.path.join(BASE_DIR, "db.sqlite3"))),
+        }
+    }
+
+# Проверять постоянные соединения в начале каждого запроса.
+DB_HEALTH_CHECKS = os.getenv('DB_HEALTH_CHECKS', 'True') == 'True'
+
+# Выполняются для каждого нового соединения с SQLite.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000)),
+    'temp_store': 'MEMORY',
+    'cache_size': -16000,
+    'mmap_size': 134217728,
+}
+
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': str(os.path.join(BASE_DIR, "db.sqlite3")),
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
     }
 }
 
+# LRU-кэш id пользователя -> username/роль в памяти процесса.
+USER_CACHE = {
+    'SIZE': 1024,
+    'TIMEOUT': 300,
+}
+
+RESPONSE_CACHE = {
+    'ALIAS': 'default',
+    'TIMEOUT': 60,
+    'TIMEOUTS': {
+        'titles': 60,
+        'genres': 300,
+        'categories': 300,
+        'reviews': 30,
+        'comments': 30,
+    },
+}
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -102,25 +169,94 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    'DEFAULT_THROTTLE_RATES': {
+        'signup': '10/min',
+        'token': '20/min',
+    },
 }
 
+# Кэш счётчиков ограничения частоты регистрации и выдачи токенов. С
+# локальным кэшем лимит считается в каждом процессе отдельно.
+THROTTLE_CACHE = 'default'
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Сколько секунд кэшируется версия токенов пользователя. С локальным
+# кэшем отзыв токена доходит до остальных процессов не позже этого срока.
+TOKEN_VERSION_CACHE_TIMEOUT = 60
+
+# Сколько секунд кэшируется время изменения произведения, из которого
+# строится ETag карточки. Правки из других процессов (команды, второй
+# воркер с локальным кэшем) видны клиентам не позже этого срока.
+TITLE_VERSION_CACHE_TIMEOUT = 60
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'emails'
 
+# Письма складываются в OutgoingEmail и отправляются командой
+# send_queued_mail; в режиме EAGER — сразу после коммита запроса.
+EMAIL_OUTBOX_EAGER = os.getenv('EMAIL_OUTBOX_EAGER', 'False') == 'True'
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 60
+# На сколько секунд отправитель забирает пачку писем себе.
+EMAIL_OUTBOX_LEASE = 300
+# Сколько хранятся отправленные и брошенные письма; удаляет их
+# команда purge_confirmation_codes.
+EMAIL_OUTBOX_KEEP = timedelta(days=7)
+
+# Пакетное создание произведений: POST /api/v1/titles/bulk/.
+TITLES_BULK_MAX_ITEMS = 5000
+TITLES_BULK_BATCH_SIZE = 500
+
+# Сколько строк выгрузка NDJSON читает из базы за один раз.
+EXPORT_CHUNK_SIZE = 2000
+
+# Метрики запросов: заголовок Server-Timing и гистограммы по именам
+# маршрутов, доступные администратору на /api/v1/_metrics/.
+REQUEST_METRICS = {
+    'ENABLED': os.getenv('REQUEST_METRICS', 'False') == 'True',
+    'BUCKETS': (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+    'QUERY_BUCKETS': (1, 2, 5, 10, 20, 50, 100),
+}
+
+# Отладочный режим для dev/staging: повторяющиеся в одном запросе
+# одинаковые SQL-запросы (N+1, от REPEAT_THRESHOLD штук) и запросы
+# дольше SLOW_QUERY_MS пишутся в лог api.queries.
+QUERY_INSPECTOR = {
+    'ENABLED': os.getenv('QUERY_INSPECTOR', 'False') == 'True',
+    'SLOW_QUERY_MS': int(os.getenv('SLOW_QUERY_MS', 100)),
+    'REPEAT_THRESHOLD': int(os.getenv('QUERY_REPEAT_THRESHOLD', 3)),
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'api.queries': {'handlers': ['console'], 'level': 'WARNING'},
+    },
+}
+
+# Размер пула потоков для запросов к базе из асинхронных view.
+ASYNC_DB_THREADS = int(os.getenv('ASYNC_DB_THREADS', 8))
+
 AUTH_USER_MODEL = 'reviews.User'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
 
 CONFIRMATION_CODE = shortuuid.uuid()[:6]
+CONFIRMATION_CODE_LIFETIME = timedelta(hours=1)
+CONFIRMATION_CODE_ATTEMPTS = 5
 FROM_MAIL = 'project@mail.ru'
 THEME_MAIL = 'Confirmation Code'
 TEXT_MAIL = f'Your confirmation code: {CONFIRMATION_CODE}'
@@ -0,0 +1,62 @@
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+
+from reviews import facets, search
+from reviews.models import Title
+
+# Ограничение на число параметров в одном запросе к SQLite.
+IDS_CHUNK_SIZE = 500
+
+
+def insert_titles(titles, batch_size):
+    Title.objects.bulk_create(titles, batch_size)
+    if titles and titles[0].pk is None:
+        # SQLite в Django 3.2 не возвращает id из bulk_create. Внутри
+        # транзакции другие записи в таблицу невозможны, а AUTOINCREMENT
+        # выдаёт id по возрастанию, поэтому новые строки — последние.
+        ids = Title.objects.order_by('-pk').values_list(
+            'pk', flat=True)[:len(titles)]
+        for title, pk in zip(titles, reversed(ids)):
+            title.pk = pk
+    return titles
+
+
+def load_titles(ids):
+    titles = Title.objects.select_related('category').prefetch_related(
+        'genre').order_by('pk')
+    result = []
+    for start in range(0, len(ids), IDS_CHUNK_SIZE):
+        result.extend(titles.filter(pk__in=ids[start:start + IDS_CHUNK_SIZE]))
+    return result
+
+
+def create_titles(items):
+    """Создаёт произведения пачкой и возвращает их с жанрами и категорией.
+
+    items — словари с name, year, description, category_id и genre_ids.
+    bulk_create не вызывает сигналы, поэтому поисковый индекс и
+    счётчики фасетов обновляются здесь же.
+    """
+    batch_size = settings.TITLES_BULK_BATCH_SIZE
+    deltas = Counter()
+    with transaction.atomic():
+        titles = insert_titles([
+            Title(name=item['name'], year=item['year'],
+                  description=item.get('description'),
+                  category_id=item['category_id'])
+            for item in items
+        ], batch_size)
+        Title.genre.through.objects.bulk_create((
+            Title.genre.through(title_id=title.pk, genre_id=genre_id)
+            for title, item in zip(titles, items)
+            for genre_id in item['genre_ids']
+        ), batch_size)
+        for item in items:
+            deltas.update(facets.title_deltas(
+                item['category_id'], item['year'], item['genre_ids'], 1))
+        facets.change_facets(deltas)
+        titles = load_titles([title.pk for title in titles])
+        search.index_titles(titles)
+    return titles
@@ -0,0 +1,49 @@
+import shortuuid
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from reviews.models import ConfirmationCode
+
+
+def hash_code(code):
+    return salted_hmac(
+        'reviews.confirmation', code, algorithm='sha256').hexdigest()
+
+
+def issue_code(user):
+    code = shortuuid.uuid()[:6]
+    ConfirmationCode.objects.update_or_create(
+        user=user,
+        defaults={
+            'code_hash': hash_code(code),
+            'expires_at': timezone.now() + settings.CONFIRMATION_CODE_LIFETIME,
+            'attempts': 0,
+        }
+    )
+    return code
+
+
+def check_code(user, code):
+    # user должен быть загружен с select_related('confirmation'),
+    # тогда проверка не делает дополнительных запросов на чтение.
+    try:
+        confirmation = user.confirmation
+    except ConfirmationCode.DoesNotExist:
+        return False
+    if (confirmation.expires_at <= timezone.now()
+            or confirmation.attempts >= settings.CONFIRMATION_CODE_ATTEMPTS):
+        return False
+    if not constant_time_compare(confirmation.code_hash, hash_code(code)):
+        ConfirmationCode.objects.filter(pk=confirmation.pk).update(
+            attempts=F('attempts') + 1)
+        return False
+    confirmation.delete()
+    return True
+
+
+def purge_expired_codes():
+    deleted, _ = ConfirmationCode.objects.filter(
+        expires_at__lte=timezone.now()).delete()
+    return deleted
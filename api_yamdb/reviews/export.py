@@ -0,0 +1,71 @@
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from reviews.models import Comment, Review, Title
+
+
+def title_records(chunk_size):
+    # iterator() в Django 3.2 отключает prefetch_related, поэтому
+    # произведения читаются пачками по id вместе с жанрами.
+    titles = Title.objects.select_related('category').prefetch_related(
+        'genre').order_by('pk')
+    last_pk = 0
+    while True:
+        chunk = list(titles.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return
+        for title in chunk:
+            yield {
+                'type': 'title',
+                'id': title.pk,
+                'name': title.name,
+                'year': title.year,
+                'description': title.description,
+                'category': title.category.slug if title.category else None,
+                'genre': [genre.slug for genre in title.genre.all()],
+                'rating': title.rating,
+            }
+        last_pk = chunk[-1].pk
+
+
+def review_records(since, chunk_size):
+    reviews = Review.objects.order_by('pk')
+    if since is not None:
+        reviews = reviews.filter(pub_date__gte=since)
+    for review in reviews.values(
+        'id', 'title_id', 'author__username', 'text', 'score', 'pub_date'
+    ).iterator(chunk_size):
+        review['author'] = review.pop('author__username')
+        yield {'type': 'review', **review}
+
+
+def comment_records(since, chunk_size):
+    comments = Comment.objects.order_by('pk')
+    if since is not None:
+        comments = comments.filter(pub_date__gte=since)
+    for comment in comments.values(
+        'id', 'review_id', 'author__username', 'text', 'pub_date'
+    ).iterator(chunk_size):
+        comment['author'] = comment.pop('author__username')
+        yield {'type': 'comment', **comment}
+
+
+def export_records(since=None, chunk_size=None):
+    """Произведения целиком, затем отзывы и комментарии.
+
+    since ограничивает отзывы и комментарии датой pub_date; она
+    обновляется при каждом изменении записи, так что повторная
+    выгрузка с датой прошлой забирает и новые, и изменённые.
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    yield from title_records(chunk_size)
+    yield from review_records(since, chunk_size)
+    yield from comment_records(since, chunk_size)
+
+
+def ndjson_lines(records):
+    for record in records:
+        yield json.dumps(
+            record, ensure_ascii=False, cls=DjangoJSONEncoder) + '\n'
@@ -0,0 +1,86 @@
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from reviews.models import Category, FacetCount, Genre, Title
+
+FACETS = (FacetCount.GENRE, FacetCount.CATEGORY, FacetCount.YEAR)
+
+
+def title_deltas(category_id, year, genre_ids, sign):
+    deltas = Counter()
+    if category_id is not None:
+        deltas[FacetCount.CATEGORY, category_id] += sign
+    if year is not None:
+        deltas[FacetCount.YEAR, year] += sign
+    for genre_id in genre_ids:
+        deltas[FacetCount.GENRE, genre_id] += sign
+    return deltas
+
+
+def change_facets(deltas):
+    for (facet, key), delta in deltas.items():
+        if not delta:
+            continue
+        counts = FacetCount.objects.filter(facet=facet, key=key)
+        if counts.update(count=F('count') + delta):
+            continue
+        try:
+            with transaction.atomic():
+                FacetCount.objects.create(facet=facet, key=key, count=delta)
+        except IntegrityError:
+            # Строку успел создать параллельный запрос.
+            counts.update(count=F('count') + delta)
+
+
+def count_facets(titles):
+    titles = titles.order_by()
+    for facet in FACETS:
+        counts = titles.filter(
+            **{f'{facet}__isnull': False}
+        ).values_list(facet).annotate(count=Count('pk'))
+        for key, count in counts:
+            yield facet, key, count
+
+
+def rebuild_facets():
+    rows = [
+        FacetCount(facet=facet, key=key, count=count)
+        for facet, key, count in count_facets(Title.objects.all())
+    ]
+    with transaction.atomic():
+        FacetCount.objects.all().delete()
+        FacetCount.objects.bulk_create(rows, 1000)
+    return len(rows)
+
+
+def render_facets(rows):
+    rows = [row for row in rows if row[2] > 0]
+    keys = {facet: [key for row_facet, key, _ in rows if row_facet == facet]
+            for facet in FACETS}
+    slugs = {
+        FacetCount.GENRE: dict(Genre.objects.filter(
+            pk__in=keys[FacetCount.GENRE]).values_list('pk', 'slug')),
+        FacetCount.CATEGORY: dict(Category.objects.filter(
+            pk__in=keys[FacetCount.CATEGORY]).values_list('pk', 'slug')),
+    }
+    result = {facet: {} for facet in FACETS}
+    for facet, key, count in sorted(rows):
+        if facet == FacetCount.YEAR:
+            result[facet][key] = count
+        elif key in slugs[facet]:
+            result[facet][slugs[facet][key]] = count
+    return result
+
+
+def stored_facets():
+    return render_facets(
+        FacetCount.objects.values_list('facet', 'key', 'count'))
+
+
+def filtered_facets(queryset):
+    # Фильтры и поиск могут добавлять к выборке соединения и аннотации,
+    # поэтому считаем по чистому запросу с подзапросом на id.
+    titles = Title.objects.filter(pk__in=queryset.order_by().values('pk'))
+    return render_facets(list(count_facets(titles)))
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from reviews.export import export_records, ndjson_lines
+
+
+class Command(BaseCommand):
+    help = ('Выгружает произведения, отзывы и комментарии в NDJSON '
+            '(по объекту в строке).')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since',
+            help='Только отзывы и комментарии с pub_date не раньше '
+                 'даты (ГГГГ-ММ-ДД).'
+        )
+        parser.add_argument(
+            '--output',
+            help='Файл для выгрузки; по умолчанию stdout.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=settings.EXPORT_CHUNK_SIZE,
+            help='Сколько строк читать из базы за один раз.'
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            since = parse_date(options['since'])
+            if since is None:
+                raise CommandError('Дата --since должна быть ГГГГ-ММ-ДД.')
+        lines = ndjson_lines(export_records(since, options['chunk_size']))
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8') as file:
+            file.writelines(lines)
@@ -0,0 +1,170 @@
+import csv
+import time
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.facets import rebuild_facets
+from reviews.ratings import rebuild_ratings
+from reviews.search import rebuild_index
+
+DATA_DIR = settings.BASE_DIR / 'static' / 'data'
+
+
+def to_id(value):
+    return int(value) if value else None
+
+
+class Command(BaseCommand):
+    help = 'Загружает данные из CSV-файлов static/data в базу.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=str(DATA_DIR),
+            help='Каталог с CSV-файлами.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество строк в одном INSERT.'
+        )
+
+    def handle(self, *args, **options):
+        data_dir = options['path']
+        self.batch_size = options['batch_size']
+        if self.batch_size < 1:
+            raise CommandError('--batch-size должен быть больше нуля.')
+        # Уже загруженные id: повторный запуск пропускает эти строки,
+        # а по ним же проверяются внешние ключи следующих файлов.
+        self.known_ids = {}
+        files = (
+            ('users.csv', User, self.build_user),
+            ('category.csv', Category, self.build_category),
+            ('genre.csv', Genre, self.build_genre),
+            ('titles.csv', Title, self.build_title),
+            ('genre_title.csv', Title.genre.through, self.build_genre_title),
+            ('review.csv', Review, self.build_review),
+            ('comments.csv', Comment, self.build_comment),
+        )
+        for filename, model, build in files:
+            self.import_file(f'{data_dir}/{filename}', model, build)
+        # bulk_create не вызывает сигналы, поэтому производные данные
+        # пересчитываются целиком после загрузки.
+        rebuild_ratings()
+        rebuild_index()
+        rebuild_facets()
+
+    def load_known_ids(self, model):
+        self.known_ids[model] = set(
+            model.objects.values_list('pk', flat=True).iterator())
+        return self.known_ids[model]
+
+    def read_objects(self, path, model, build, stats):
+        known = self.load_known_ids(model)
+        with open(path, encoding='utf-8', newline='') as csv_file:
+            for row in csv.DictReader(csv_file):
+                stats['read'] += 1
+                pk = int(row['id'])
+                if pk in known:
+                    stats['skipped'] += 1
+                    continue
+                obj = build(row)
+                if obj is None:
+                    stats['skipped'] += 1
+                    continue
+                obj.pk = pk
+                known.add(pk)
+                yield obj
+
+    def import_file(self, path, model, build):
+        stats = {'read': 0, 'skipped': 0, 'created': 0}
+        started = time.monotonic()
+        objects = self.read_objects(path, model, build, stats)
+        try:
+            with transaction.atomic():
+                while True:
+                    batch = list(islice(objects, self.batch_size))
+                    if not batch:
+                        break
+                    model.objects.bulk_create(batch, self.batch_size)
+                    stats['created'] += len(batch)
+                self.reset_sequence(model)
+        except FileNotFoundError:
+            raise CommandError(f'Файл {path} не найден.')
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f'{path}: прочитано {stats["read"]}, '
+            f'создано {stats["created"]}, пропущено {stats["skipped"]} '
+            f'за {elapsed:.2f} с '
+            f'({stats["read"] / elapsed if elapsed else 0:.0f} строк/с)'
+        )
+
+    def reset_sequence(self, model):
+        statements = connection.ops.sequence_reset_sql(no_style(), [model])
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+    def known_id(self, model, value):
+        pk = to_id(value)
+        return pk if pk in self.known_ids[model] else None
+
+    def build_user(self, row):
+        return User(
+            username=row['username'],
+            email=row['email'],
+            role=row['role'],
+            bio=row['bio'],
+            first_name=row['first_name'],
+            last_name=row['last_name'],
+            password=make_password(None),
+        )
+
+    def build_category(self, row):
+        return Category(name=row['name'], slug=row['slug'])
+
+    def build_genre(self, row):
+        return Genre(name=row['name'], slug=row['slug'])
+
+    def build_title(self, row):
+        return Title(
+            name=row['name'],
+            year=int(row['year']),
+            category_id=self.known_id(Category, row['category']),
+        )
+
+    def build_genre_title(self, row):
+        title_id = self.known_id(Title, row['title_id'])
+        genre_id = self.known_id(Genre, row['genre_id'])
+        if title_id is None or genre_id is None:
+            return None
+        return Title.genre.through(title_id=title_id, genre_id=genre_id)
+
+    def build_review(self, row):
+        title_id = self.known_id(Title, row['title_id'])
+        if title_id is None:
+            return None
+        return Review(
+            title_id=title_id,
+            text=row['text'],
+            author_id=self.known_id(User, row['author']),
+            score=int(row['score']),
+        )
+
+    def build_comment(self, row):
+        review_id = self.known_id(Review, row['review_id'])
+        if review_id is None:
+            return None
+        return Comment(
+            review_id=review_id,
+            text=row['text'],
+            author_id=self.known_id(User, row['author']),
+        )
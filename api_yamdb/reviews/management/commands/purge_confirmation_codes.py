@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from reviews.confirmation import purge_expired_codes
+from reviews.outbox import purge_outbox
+
+
+class Command(BaseCommand):
+    help = ('Удаляет просроченные коды подтверждения и старые письма '
+            'с ними из очереди.')
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_codes()
+        self.stdout.write(f'Удалено просроченных кодов: {deleted}.')
+        deleted = purge_outbox()
+        self.stdout.write(f'Удалено старых писем: {deleted}.')
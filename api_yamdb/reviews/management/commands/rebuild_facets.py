@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from reviews.facets import rebuild_facets
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики жанров, категорий и годов произведений.'
+
+    def handle(self, *args, **options):
+        rows = rebuild_facets()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано счётчиков: {rows}.'))
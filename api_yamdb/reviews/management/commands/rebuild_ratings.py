@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.ratings import inconsistent_ratings, rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённые рейтинги произведений по отзывам.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить согласованность, ничего не меняя.'
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            broken = inconsistent_ratings().values_list(
+                'pk', 'rating_sum', 'rating_count',
+                'actual_sum', 'actual_count')
+            mismatches = 0
+            for pk, stored_sum, stored_count, real_sum, real_count in broken:
+                mismatches += 1
+                self.stdout.write(
+                    f'title {pk}: stored {stored_sum}/{stored_count}, '
+                    f'actual {real_sum}/{real_count}')
+            if mismatches:
+                raise CommandError(
+                    f'Рейтинг не согласован у {mismatches} произведений.')
+            self.stdout.write(self.style.SUCCESS('Рейтинги согласованы.'))
+            return
+        updated = rebuild_ratings()
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитаны рейтинги {updated} произведений.'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from reviews.search import rebuild_index, search_vendor
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс произведений.'
+
+    def handle(self, *args, **options):
+        if search_vendor() is None:
+            self.stdout.write(
+                'Полнотекстовый поиск для этой СУБД не поддерживается.')
+            return
+        indexed = rebuild_index()
+        self.stdout.write(
+            self.style.SUCCESS(f'Проиндексировано произведений: {indexed}.'))
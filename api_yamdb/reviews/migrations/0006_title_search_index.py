@@ -0,0 +1,63 @@
+from django.db import migrations
+
+SQLITE_TABLE = 'reviews_title_fts'
+POSTGRES_TABLE = 'reviews_title_search'
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE {SQLITE_TABLE} '
+            'USING fts5(name, genre, category)')
+        # Совпадение в названии весит больше, чем в жанре и категории.
+        schema_editor.execute(
+            f'INSERT INTO {SQLITE_TABLE} ({SQLITE_TABLE}, rank) '
+            "VALUES ('rank', 'bm25(10.0, 3.0, 1.0)')")
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE TABLE {POSTGRES_TABLE} ('
+            'title_id integer PRIMARY KEY, document tsvector NOT NULL)')
+        schema_editor.execute(
+            f'CREATE INDEX {POSTGRES_TABLE}_document_idx '
+            f'ON {POSTGRES_TABLE} USING GIN (document)')
+    else:
+        return
+    Title = apps.get_model('reviews', 'Title')
+    for title in Title.objects.select_related('category').prefetch_related(
+            'genre'):
+        document = [
+            title.name,
+            ' '.join(genre.name for genre in title.genre.all()),
+            title.category.name if title.category_id else '',
+        ]
+        if vendor == 'sqlite':
+            schema_editor.execute(
+                f'INSERT INTO {SQLITE_TABLE} (rowid, name, genre, category) '
+                'VALUES (%s, %s, %s, %s)', [title.pk, *document])
+        else:
+            schema_editor.execute(
+                f'INSERT INTO {POSTGRES_TABLE} (title_id, document) VALUES '
+                "(%s, setweight(to_tsvector('simple', %s), 'A') || "
+                "setweight(to_tsvector('simple', %s), 'B') || "
+                "setweight(to_tsvector('simple', %s), 'C'))",
+                [title.pk, *document])
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE {SQLITE_TABLE}')
+    elif vendor == 'postgresql':
+        schema_editor.execute(f'DROP TABLE {POSTGRES_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_review_comment_pub_date_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 3.2 on 2026-10-18 09:52
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_facet_counts(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    FacetCount = apps.get_model('reviews', 'FacetCount')
+    rows = []
+    for facet in ('genre', 'category', 'year'):
+        counts = Title.objects.order_by().filter(
+            **{f'{facet}__isnull': False}
+        ).values_list(facet).annotate(count=Count('pk'))
+        rows.extend(
+            FacetCount(facet=facet, key=key, count=count)
+            for key, count in counts)
+    FacetCount.objects.bulk_create(rows, 1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_user_token_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacetCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('facet', models.CharField(choices=[('genre', 'Жанр'), ('category', 'Категория'), ('year', 'Год')], max_length=16)),
+                ('key', models.IntegerField(help_text='id жанра или категории либо год')),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='facetcount',
+            constraint=models.UniqueConstraint(fields=('facet', 'key'), name='unique_facet_key'),
+        ),
+        migrations.RunPython(fill_facet_counts, migrations.RunPython.noop),
+    ]
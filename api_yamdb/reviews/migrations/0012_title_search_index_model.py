@@ -0,0 +1,27 @@
+# Generated by Django 3.2 on 2026-10-18 10:47
+
+from django.db import migrations, models
+import django.db.models.deletion
+import reviews.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_title_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleSearchIndex',
+            fields=[
+                ('title', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='reviews.title')),
+                ('document', reviews.models.MatchField(db_column='reviews_title_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'reviews_title_fts',
+                'managed': False,
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 10:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0012_title_search_index_model'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, help_text='Меняется и при изменении отзывов, жанров и категории', verbose_name='Изменено'),
+        ),
+    ]
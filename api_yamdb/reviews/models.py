@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 from reviews.validators import validate_year
@@ -26,7 +27,7 @@ class User(AbstractUser):
         choices=ROLE_CHOICES,
         default=USER
     )
-    confirmation_code = models.CharField(max_length=6, blank=True, null=True)
+    token_version = models.PositiveIntegerField(default=0)
 
     class Meta:
         constraints = [
@@ -47,6 +48,21 @@ class User(AbstractUser):
         return self.role == MODERATOR
 
 
+class ConfirmationCode(models.Model):
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='confirmation'
+    )
+    code_hash = models.CharField(max_length=64)
+    expires_at = models.DateTimeField(db_index=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.user_id}: {self.expires_at}'
+
+
 class Category(models.Model):
     name = models.CharField(
         verbose_name='Категория',
@@ -94,7 +110,9 @@ class Title(models.Model):
         related_name='titles',
         verbose_name='Категория',
         blank=True, null=True,
-        help_text='Выберите категорию'
+        help_text='Выберите категорию',
+        # Поиск по категории покрывает title_category_name_idx.
+        db_index=False
     )
     genre = models.ManyToManyField(
         Genre,
@@ -106,13 +124,94 @@ class Title(models.Model):
         validators=[validate_year],
         verbose_name='Год'
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Сумма оценок'
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество оценок'
+    )
+    modified = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Изменено',
+        help_text='Меняется и при изменении отзывов, жанров и категории'
+    )
 
     class Meta:
+        indexes = [
+            models.Index(fields=['name'], name='title_name_idx'),
+            models.Index(fields=['year', 'name'],
+                         name='title_year_name_idx'),
+            models.Index(fields=['category', 'name'],
+                         name='title_category_name_idx'),
+        ]
         ordering = ['name']
 
     def __str__(self):
         return self.name
 
+    @property
+    def rating(self):
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+
+class MatchField(models.TextField):
+    """Скрытый столбец FTS5 с именем таблицы: по нему пишется MATCH."""
+
+
+@MatchField.register_lookup
+class Match(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', [*lhs_params, *rhs_params]
+
+
+class TitleSearchIndex(models.Model):
+    # Виртуальная таблица FTS5 из миграции 0006 (только SQLite). Модель
+    # нужна, чтобы присоединить индекс к произведениям одним JOIN: MATCH
+    # выполняется один раз на запрос, а порядок задаёт столбец rank.
+    title = models.OneToOneField(
+        Title, primary_key=True, db_column='rowid',
+        on_delete=models.DO_NOTHING, related_name='search_index')
+    document = MatchField(db_column='reviews_title_fts')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'reviews_title_fts'
+
+
+class FacetCount(models.Model):
+    GENRE = 'genre'
+    CATEGORY = 'category'
+    YEAR = 'year'
+    FACET_CHOICES = [
+        (GENRE, 'Жанр'),
+        (CATEGORY, 'Категория'),
+        (YEAR, 'Год'),
+    ]
+
+    facet = models.CharField(max_length=16, choices=FACET_CHOICES)
+    key = models.IntegerField(
+        help_text='id жанра или категории либо год'
+    )
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['facet', 'key'],
+                                    name='unique_facet_key')
+        ]
+
+    def __str__(self):
+        return f'{self.facet} {self.key}: {self.count}'
+
 
 class Review(models.Model):
     title = models.ForeignKey(Title, on_delete=models.CASCADE, blank=True,
@@ -143,6 +242,10 @@ class Review(models.Model):
                 name='unique_author_review'
             )
         ]
+        indexes = [
+            models.Index(fields=['title', '-pub_date', '-id'],
+                         name='review_title_pub_date_idx')
+        ]
         ordering = ['-pub_date']
 
     def __str__(self):
@@ -164,7 +267,33 @@ class Comment(models.Model):
     pub_date = models.DateField(auto_now=True)
 
     class Meta:
+        indexes = [
+            models.Index(fields=['review', '-pub_date', '-id'],
+                         name='comment_review_pub_date_idx')
+        ]
         ordering = ['-pub_date']
 
     def __str__(self):
         return self.text
+
+
+class OutgoingEmail(models.Model):
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    to = models.EmailField(max_length=254)
+    created = models.DateTimeField(auto_now_add=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt = models.DateTimeField(default=timezone.now)
+    sent = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['sent', 'next_attempt'],
+                         name='outgoing_email_pending_idx')
+        ]
+        ordering = ['next_attempt']
+
+    def __str__(self):
+        return f'{self.subject} -> {self.to}'
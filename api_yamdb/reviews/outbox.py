@@ -0,0 +1,118 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from reviews.models import OutgoingEmail
+
+
+def queue_mail(subject, message, from_email, recipient_list):
+    emails = [
+        OutgoingEmail(subject=subject, body=message,
+                      from_email=from_email, to=recipient)
+        for recipient in recipient_list
+    ]
+    if not settings.EMAIL_OUTBOX_EAGER:
+        OutgoingEmail.objects.bulk_create(emails)
+        return
+    # Запрос отправляет только свои письма, поэтому нужны их id, а
+    # bulk_create на SQLite их не возвращает.
+    for email in emails:
+        email.save()
+    ids = [email.pk for email in emails]
+    transaction.on_commit(lambda: send_pending(ids=ids))
+
+
+def pending_emails():
+    return OutgoingEmail.objects.filter(
+        sent__isnull=True,
+        attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        next_attempt__lte=timezone.now(),
+    )
+
+
+def mark_failed(email, error):
+    email.attempts += 1
+    email.last_error = str(error)
+    email.next_attempt = timezone.now() + timedelta(
+        seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1))
+    email.save(update_fields=['attempts', 'last_error', 'next_attempt'])
+
+
+def claim_emails(queryset, limit):
+    # Забранное письмо уходит в аренду: next_attempt сдвигается вперёд,
+    # и другие отправители его не видят. Если процесс упадёт, не
+    # отправив письмо, оно вернётся в очередь, когда аренда истечёт.
+    lease = timezone.now() + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE)
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            emails = list(queryset.select_for_update(skip_locked=True)[
+                :limit])
+            OutgoingEmail.objects.filter(
+                pk__in=[email.pk for email in emails]
+            ).update(next_attempt=lease)
+        return emails
+    # Без SKIP LOCKED (SQLite) каждое письмо забирается условным UPDATE:
+    # он пройдёт, только если next_attempt никто не успел сдвинуть.
+    return [
+        email for email in queryset[:limit]
+        if OutgoingEmail.objects.filter(
+            pk=email.pk, next_attempt=email.next_attempt, sent__isnull=True
+        ).update(next_attempt=lease)
+    ]
+
+
+def send_pending(batch_size=None, ids=None):
+    queryset = pending_emails()
+    if ids is not None:
+        queryset = queryset.filter(pk__in=ids)
+    emails = claim_emails(
+        queryset, batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE)
+    if not emails:
+        return 0
+    # Одно соединение на всю пачку: для SMTP это одно рукопожатие
+    # вместо отдельного на каждое письмо.
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        for email in emails:
+            mark_failed(email, error)
+        return 0
+    sent = 0
+    try:
+        for email in emails:
+            message = EmailMessage(
+                email.subject, email.body, email.from_email, [email.to],
+                connection=connection)
+            try:
+                message.send()
+            except Exception as error:
+                mark_failed(email, error)
+                continue
+            # В тексте письма код подтверждения открытым текстом: после
+            # отправки он в базе не нужен.
+            email.attempts += 1
+            email.sent = timezone.now()
+            email.body = ''
+            email.save(update_fields=['attempts', 'sent', 'body'])
+            sent += 1
+    finally:
+        connection.close()
+    return sent
+
+
+def purge_outbox():
+    # Отправленные и брошенные после всех попыток письма хранятся
+    # EMAIL_OUTBOX_KEEP для разбора ошибок, потом удаляются.
+    border = timezone.now() - settings.EMAIL_OUTBOX_KEEP
+    deleted, _ = OutgoingEmail.objects.filter(
+        Q(sent__lte=border)
+        | Q(sent__isnull=True,
+            attempts__gte=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+            created__lte=border)
+    ).delete()
+    return deleted
@@ -0,0 +1,39 @@
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from reviews.models import Review, Title
+from reviews.title_versions import forget_titles
+
+
+def change_rating(title_id, score_delta, count_delta=0):
+    # Вызывается в одной транзакции с записью отзыва.
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=F('rating_sum') + score_delta,
+        rating_count=F('rating_count') + count_delta,
+        modified=timezone.now(),
+    )
+    forget_titles([title_id])
+
+
+def rebuild_ratings():
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')).order_by().values('title')
+    return Title.objects.update(
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0),
+        rating_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('pk')).values('total')),
+            0),
+        modified=timezone.now(),
+    )
+
+
+def inconsistent_ratings():
+    return Title.objects.order_by().annotate(
+        actual_sum=Coalesce(Sum('reviews__score'), 0),
+        actual_count=Count('reviews'),
+    ).filter(
+        ~Q(rating_sum=F('actual_sum')) | ~Q(rating_count=F('actual_count'))
+    )
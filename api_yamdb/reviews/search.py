@@ -0,0 +1,131 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from reviews.models import Title
+
+SQLITE_TABLE = 'reviews_title_fts'
+POSTGRES_TABLE = 'reviews_title_search'
+POSTGRES_DOCUMENT = (
+    "setweight(to_tsvector('simple', %s), 'A') || "
+    "setweight(to_tsvector('simple', %s), 'B') || "
+    "setweight(to_tsvector('simple', %s), 'C')"
+)
+TOKEN_RE = re.compile(r'\w+')
+CHUNK_SIZE = 1000
+
+
+def search_vendor():
+    if connection.vendor in ('sqlite', 'postgresql'):
+        return connection.vendor
+    return None
+
+
+def title_document(title):
+    return (
+        title.name,
+        ' '.join(genre.name for genre in title.genre.all()),
+        title.category.name if title.category_id else '',
+    )
+
+
+def index_titles(titles):
+    vendor = search_vendor()
+    if vendor is None:
+        return
+    with connection.cursor() as cursor:
+        for title in titles:
+            if vendor == 'sqlite':
+                cursor.execute(
+                    f'DELETE FROM {SQLITE_TABLE} WHERE rowid = %s',
+                    [title.pk])
+                cursor.execute(
+                    f'INSERT INTO {SQLITE_TABLE} '
+                    '(rowid, name, genre, category) VALUES (%s, %s, %s, %s)',
+                    [title.pk, *title_document(title)])
+            else:
+                cursor.execute(
+                    f'INSERT INTO {POSTGRES_TABLE} (title_id, document) '
+                    f'VALUES (%s, {POSTGRES_DOCUMENT}) '
+                    'ON CONFLICT (title_id) '
+                    'DO UPDATE SET document = EXCLUDED.document',
+                    [title.pk, *title_document(title)])
+
+
+def index_title(title):
+    index_titles([title])
+
+
+def reindex_titles(title_ids):
+    title_ids = list(title_ids)
+    titles = Title.objects.select_related('category').prefetch_related(
+        'genre')
+    for start in range(0, len(title_ids), CHUNK_SIZE):
+        index_titles(titles.filter(
+            pk__in=title_ids[start:start + CHUNK_SIZE]))
+
+
+def remove_title(title_id):
+    vendor = search_vendor()
+    if vendor is None:
+        return
+    with connection.cursor() as cursor:
+        if vendor == 'sqlite':
+            cursor.execute(
+                f'DELETE FROM {SQLITE_TABLE} WHERE rowid = %s', [title_id])
+        else:
+            cursor.execute(
+                f'DELETE FROM {POSTGRES_TABLE} WHERE title_id = %s',
+                [title_id])
+
+
+def rebuild_index():
+    vendor = search_vendor()
+    if vendor is None:
+        return 0
+    with connection.cursor() as cursor:
+        table = SQLITE_TABLE if vendor == 'sqlite' else POSTGRES_TABLE
+        cursor.execute(f'DELETE FROM {table}')
+    titles = Title.objects.select_related('category').prefetch_related(
+        'genre').order_by('pk')
+    indexed = 0
+    last_pk = 0
+    while True:
+        chunk = list(titles.filter(pk__gt=last_pk)[:CHUNK_SIZE])
+        if not chunk:
+            return indexed
+        index_titles(chunk)
+        indexed += len(chunk)
+        last_pk = chunk[-1].pk
+
+
+def search_titles(queryset, term):
+    tokens = TOKEN_RE.findall(term)
+    if not tokens:
+        return queryset
+    vendor = search_vendor()
+    title_id = f'{Title._meta.db_table}.{Title._meta.pk.column}'
+    if vendor == 'sqlite':
+        # Индекс присоединяется к произведениям: SQLite начинает с MATCH
+        # по FTS5 и находит произведения по первичному ключу, а не
+        # повторяет MATCH для каждой строки.
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        return queryset.filter(search_index__document__match=match).order_by(
+            'search_index__rank', 'name')
+    if vendor == 'postgresql':
+        query = ' & '.join(f'{token}:*' for token in tokens)
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT title_id FROM {POSTGRES_TABLE} '
+            "WHERE document @@ to_tsquery('simple', %s)", (query,)
+        )).annotate(search_rank=RawSQL(
+            "SELECT ts_rank(document, to_tsquery('simple', %s)) "
+            f'FROM {POSTGRES_TABLE} WHERE title_id = {title_id}', (query,)
+        )).order_by('-search_rank', 'name')
+    for token in tokens:
+        queryset = queryset.filter(
+            Q(name__icontains=token)
+            | Q(genre__name__icontains=token)
+            | Q(category__name__icontains=token))
+    return queryset.distinct()
@@ -0,0 +1,162 @@
+from collections import Counter
+
+from django.db.models.signals import (m2m_changed, post_delete, post_init,
+                                      post_save, pre_delete)
+from django.dispatch import receiver
+
+from reviews import facets, search
+from reviews.models import Category, FacetCount, Genre, Title, User
+from reviews.title_versions import forget_titles, touch_titles
+from reviews.user_cache import forget_user
+
+
+@receiver(post_save, sender=Title)
+def index_saved_title(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_title(instance)
+
+
+@receiver(post_delete, sender=Title)
+def unindex_deleted_title(sender, instance, **kwargs):
+    search.remove_title(instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_changed_user(sender, instance, **kwargs):
+    forget_user(instance.pk)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def index_title_genres(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        search.index_title(instance)
+    elif pk_set:
+        search.reindex_titles(pk_set)
+
+
+def related_titles(sender, instance):
+    lookup = 'genre' if sender is Genre else 'category'
+    return Title.objects.filter(**{lookup: instance}).values_list(
+        'pk', flat=True)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Category)
+def reindex_renamed_titles(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        search.reindex_titles(related_titles(sender, instance))
+
+
+@receiver(pre_delete, sender=Genre)
+@receiver(pre_delete, sender=Category)
+def remember_indexed_titles(sender, instance, **kwargs):
+    # Связи с жанром удаляются без m2m_changed, а категория обнуляется
+    # массовым UPDATE: произведения запоминаются до удаления.
+    instance._search_titles = list(related_titles(sender, instance))
+
+
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Category)
+def reindex_orphaned_titles(sender, instance, **kwargs):
+    search.reindex_titles(instance._search_titles)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def forget_changed_title(sender, instance, **kwargs):
+    # modified обновляет сам save() (auto_now).
+    forget_titles([instance.pk])
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def touch_title_genres(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        touch_titles([instance.pk])
+    elif pk_set:
+        touch_titles(pk_set)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Category)
+def touch_renamed_titles(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        touch_titles(related_titles(sender, instance))
+
+
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Category)
+def touch_orphaned_titles(sender, instance, **kwargs):
+    touch_titles(instance._search_titles)
+
+
+def title_facet_state(instance):
+    # __dict__, чтобы не подгружать отложенные поля.
+    return (instance.__dict__.get('category_id'),
+            instance.__dict__.get('year'))
+
+
+@receiver(post_init, sender=Title)
+def remember_title_facets(sender, instance, **kwargs):
+    instance._facet_state = title_facet_state(instance)
+
+
+@receiver(post_save, sender=Title)
+def count_saved_title(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    state = title_facet_state(instance)
+    deltas = facets.title_deltas(*state, (), 1)
+    if not created:
+        deltas.subtract(facets.title_deltas(*instance._facet_state, (), 1))
+    facets.change_facets(deltas)
+    instance._facet_state = state
+
+
+@receiver(pre_delete, sender=Title)
+def remember_deleted_title_genres(sender, instance, **kwargs):
+    # Связи с жанрами удаляются без m2m_changed.
+    instance._facet_genres = list(
+        instance.genre.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Title)
+def uncount_deleted_title(sender, instance, **kwargs):
+    facets.change_facets(facets.title_deltas(
+        *instance._facet_state, instance._facet_genres, -1))
+
+
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Category)
+def drop_deleted_facet(sender, instance, **kwargs):
+    facet = FacetCount.GENRE if sender is Genre else FacetCount.CATEGORY
+    FacetCount.objects.filter(facet=facet, key=instance.pk).delete()
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def count_title_genres(sender, instance, action, reverse, pk_set, **kwargs):
+    own, other = ('genre', 'title') if reverse else ('title', 'genre')
+    if action in ('pre_remove', 'pre_clear'):
+        # В pk_set для remove попадают и несвязанные id: запоминаем,
+        # какие связи действительно будут удалены.
+        links = sender.objects.filter(**{own: instance})
+        if pk_set is not None:
+            links = links.filter(**{f'{other}__in': pk_set})
+        instance._facet_removed = list(
+            links.values_list(f'{other}_id', flat=True))
+        return
+    if action == 'post_add':
+        ids, sign = pk_set, 1
+    elif action in ('post_remove', 'post_clear'):
+        ids, sign = instance._facet_removed, -1
+    else:
+        return
+    if reverse:
+        deltas = Counter({(FacetCount.GENRE, instance.pk): sign * len(ids)})
+    else:
+        deltas = facets.title_deltas(None, None, ids, sign)
+    facets.change_facets(deltas)
@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from reviews.models import Title
+
+CHUNK_SIZE = 1000
+
+
+def version_key(title_id):
+    return f'title-version:{title_id}'
+
+
+def get_title_version(title_id):
+    # Время последнего изменения произведения в наносекундах: из него
+    # строятся ETag и Last-Modified карточки. Кэшируется, чтобы условный
+    # GET обходился без запросов; сигналы сбрасывают запись сразу,
+    # изменения из других процессов видны не позже чем через TIMEOUT.
+    return cache.get(version_key(title_id))
+
+
+def remember_title_version(title):
+    version = (int(title.modified.timestamp()) * 10 ** 9
+               + title.modified.microsecond * 1000)
+    cache.set(version_key(title.pk), version,
+              settings.TITLE_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def forget_titles(title_ids):
+    # После коммита: иначе параллельный запрос успеет закэшировать
+    # старую версию до конца транзакции.
+    keys = [version_key(pk) for pk in title_ids]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def touch_titles(title_ids):
+    title_ids = list(title_ids)
+    for start in range(0, len(title_ids), CHUNK_SIZE):
+        chunk = title_ids[start:start + CHUNK_SIZE]
+        Title.objects.filter(pk__in=chunk).update(modified=timezone.now())
+        forget_titles(chunk)
@@ -0,0 +1,49 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+
+from reviews.models import User
+
+UserInfo = namedtuple(
+    'UserInfo', ('username', 'role', 'is_superuser', 'is_active'))
+
+_users = OrderedDict()
+_lock = threading.Lock()
+
+
+def remember_user(user_id, info):
+    expires = time.monotonic() + settings.USER_CACHE['TIMEOUT']
+    with _lock:
+        _users[user_id] = (expires, info)
+        _users.move_to_end(user_id)
+        while len(_users) > settings.USER_CACHE['SIZE']:
+            _users.popitem(last=False)
+
+
+def get_user_info(user_id):
+    # Кэш живёт в памяти процесса: сигналы сбрасывают его только здесь,
+    # изменения из других процессов видны не позже чем через TIMEOUT.
+    with _lock:
+        entry = _users.get(user_id)
+        if entry is not None and entry[0] > time.monotonic():
+            _users.move_to_end(user_id)
+            return entry[1]
+    row = User.objects.filter(pk=user_id).values_list(
+        *UserInfo._fields).first()
+    if row is None:
+        return None
+    info = UserInfo(*row)
+    remember_user(user_id, info)
+    return info
+
+
+def forget_user(user_id):
+    with _lock:
+        _users.pop(user_id, None)
+
+
+def clear_users():
+    with _lock:
+        _users.clear()
@@ -0,0 +1,344 @@
+"""Замер задержек и числа SQL-запросов для всех маршрутов api/urls.py.
+
+    python -m benchmarks.api --titles 1000 --output bench.json
+    python -m benchmarks.api --baseline bench.json --threshold 0.2
+
+Кроме GET замеряются создание, изменение и удаление произведений, отзывов,
+комментариев, жанров, категорий и пользователей; каждая итерация удаления
+и создания отзыва получает свой объект. Имена маршрутов api/urls.py, к
+которым не было ни одного запроса, выводятся как UNCOVERED.
+
+С --baseline скрипт завершается с кодом 1, если у какого-либо маршрута p95
+вырос больше чем на threshold, выросло число запросов или сменился код
+ответа.
+"""
+import argparse
+import itertools
+import json
+import sys
+import time
+from datetime import date
+
+from benchmarks.environment import setup_django, test_database
+
+BULK_ITEMS = 100
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(share * len(ordered)) - 1))
+    return ordered[index]
+
+
+def measure(client, method, path, iterations, data=None, **kwargs):
+    from django.db import connection, reset_queries
+    from django.test.utils import CaptureQueriesContext
+
+    timings = []
+    queries = []
+    status = None
+    for _ in range(iterations):
+        url = path() if callable(path) else path
+        payload = data() if callable(data) else data
+        # queries_log ограничен 9000 записями: у заполненного журнала
+        # CaptureQueriesContext насчитал бы 0 запросов.
+        reset_queries()
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = getattr(client, method)(url, data=payload, **kwargs)
+            if response.streaming:
+                # Потоковый ответ формируется при чтении.
+                b''.join(response.streaming_content)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(len(captured))
+        status = response.status_code
+    return {
+        'method': method.upper(),
+        'path': url,
+        'status': status,
+        'iterations': iterations,
+        'mean_ms': round(sum(timings) / len(timings), 3),
+        'p50_ms': round(percentile(timings, 0.50), 3),
+        'p95_ms': round(percentile(timings, 0.95), 3),
+        'p99_ms': round(percentile(timings, 0.99), 3),
+        'queries': max(queries),
+    }
+
+
+def route(path, method='get', data=None, admin=False, **kwargs):
+    return {'method': method, 'path': path, 'data': data, 'admin': admin,
+            'kwargs': kwargs}
+
+
+def build_routes(admin):
+    from reviews.models import Category, Comment, Genre, Review, Title, User
+
+    title = Title.objects.order_by('pk').first()
+    review = Review.objects.filter(title=title).order_by('pk').first()
+    comment = Comment.objects.filter(review=review).order_by('pk').first()
+    user = User.objects.order_by('pk').first()
+    category = Category.objects.order_by('pk').first()
+    genre = Genre.objects.order_by('pk').first()
+    reviews = f'/api/v1/titles/{title.pk}/reviews/'
+    comments = f'{reviews}{review.pk}/comments/'
+    counter = itertools.count()
+
+    def new_title(**ratings):
+        return Title.objects.create(
+            name=f'Замер {next(counter)}', year=2000, category=category,
+            **ratings)
+
+    def new_review():
+        return Review.objects.create(
+            title=new_title(rating_sum=5, rating_count=1), author=admin,
+            text='Замер', score=5)
+
+    def new_comment():
+        return Comment.objects.create(
+            review=review, author=admin, text='Замер')
+
+    def new_genre():
+        idx = next(counter)
+        return Genre.objects.create(name=f'Замер {idx}', slug=f'bench-{idx}')
+
+    def new_category():
+        idx = next(counter)
+        return Category.objects.create(
+            name=f'Замер {idx}', slug=f'bench-{idx}')
+
+    def new_user():
+        idx = next(counter)
+        return User.objects.create(
+            username=f'bench_{idx}', email=f'bench_{idx}@yamdb.fake')
+
+    def slug_payload():
+        idx = next(counter)
+        return {'name': f'Замер {idx}', 'slug': f'bench-{idx}'}
+
+    def user_payload():
+        idx = next(counter)
+        return {'username': f'bench_{idx}', 'email': f'bench_{idx}@yamdb.fake'}
+
+    def review_path(review):
+        return f'/api/v1/titles/{review.title_id}/reviews/{review.pk}/'
+
+    return {
+        'admin_crud-list': route('/api/v1/users/', admin=True),
+        'admin_crud-detail': route(
+            f'/api/v1/users/{user.username}/', admin=True),
+        'admin_crud-me': route('/api/v1/users/me/', admin=True),
+        'api-root': route('/api/v1/'),
+        'titles-list': route('/api/v1/titles/'),
+        'titles-detail': route(f'/api/v1/titles/{title.pk}/'),
+        'titles-facets': route('/api/v1/titles/facets/'),
+        'titles-facets-filtered': route(
+            f'/api/v1/titles/facets/?genre={genre.slug}'),
+        'genres-list': route('/api/v1/genres/'),
+        'categories-list': route('/api/v1/categories/'),
+        'export': route('/api/v1/export/', admin=True),
+        'export-since': route(
+            f'/api/v1/export/?since={date.today().isoformat()}', admin=True),
+        'metrics': route('/api/v1/_metrics/', admin=True),
+        'reviews-list': route(reviews),
+        'reviews-detail': route(f'{reviews}{review.pk}/'),
+        'comments-list': route(comments),
+        'comments-detail': route(f'{comments}{comment.pk}/'),
+        # Запросы async-view идут из пула потоков мимо соединения, которое
+        # слушает CaptureQueriesContext: для них сравнивается только время.
+        'async-titles-list': route('/api/v1/async/titles/'),
+        'async-titles-detail': route(f'/api/v1/async/titles/{title.pk}/'),
+        'async-reviews-list': route(
+            f'/api/v1/async/titles/{title.pk}/reviews/'),
+        'async-comments-list': route(
+            f'/api/v1/async/titles/{title.pk}/reviews/{review.pk}/comments/'),
+        'titles-create': route('/api/v1/titles/', 'post', lambda: {
+            'name': f'Замер {next(counter)}', 'year': 2000,
+            'category': category.slug, 'genre': [genre.slug]}),
+        'titles-partial_update': route(
+            f'/api/v1/titles/{title.pk}/', 'patch',
+            lambda: {'name': f'Замер {next(counter)}'}),
+        'titles-destroy': route(
+            lambda: f'/api/v1/titles/{new_title().pk}/', 'delete'),
+        'titles-bulk': route('/api/v1/titles/bulk/', 'post', lambda: [
+            {'name': f'Замер {next(counter)}', 'year': 2000,
+             'category': category.slug, 'genre': [genre.slug]}
+            for _ in range(BULK_ITEMS)
+        ], format='json'),
+        'reviews-create': route(
+            lambda: f'/api/v1/titles/{new_title().pk}/reviews/', 'post',
+            {'text': 'Замер', 'score': 7}),
+        'reviews-partial_update': route(
+            f'{reviews}{review.pk}/', 'patch', {'text': 'Замер'}),
+        'reviews-destroy': route(
+            lambda: review_path(new_review()), 'delete'),
+        'genres-create': route('/api/v1/genres/', 'post', slug_payload),
+        'genres-destroy': route(
+            lambda: f'/api/v1/genres/{new_genre().slug}/', 'delete'),
+        'categories-create': route(
+            '/api/v1/categories/', 'post', slug_payload),
+        'categories-destroy': route(
+            lambda: f'/api/v1/categories/{new_category().slug}/', 'delete'),
+        'admin_crud-create': route(
+            '/api/v1/users/', 'post', user_payload, admin=True),
+        'admin_crud-partial_update': route(
+            f'/api/v1/users/{user.username}/', 'patch',
+            {'first_name': 'Замер'}, admin=True),
+        'admin_crud-destroy': route(
+            lambda: f'/api/v1/users/{new_user().username}/', 'delete',
+            admin=True),
+        'admin_crud-me-partial_update': route(
+            '/api/v1/users/me/', 'patch', {'first_name': 'Замер'},
+            admin=True),
+        'comments-create': route(comments, 'post', {'text': 'Замер'}),
+        'comments-partial_update': route(
+            f'{comments}{comment.pk}/', 'patch', {'text': 'Замер'}),
+        'comments-destroy': route(
+            lambda: f'{comments}{new_comment().pk}/', 'delete'),
+    }
+
+
+def run(options):
+    from django.conf import settings
+    from django.core.cache import cache
+    from django.test import override_settings
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from benchmarks.seed import seed
+    from reviews.models import User
+
+    sizes = seed(
+        titles=options.titles, genres=options.genres,
+        categories=options.categories, users=options.users,
+        reviews_per_title=options.reviews_per_title,
+        comments_per_review=options.comments_per_review)
+    admin = User.objects.create_user(
+        username='bench_admin', email='bench_admin@yamdb.fake', role='admin')
+    client = APIClient()
+    if not options.anonymous:
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(admin)}')
+
+    results = {}
+    for name, route in build_routes(admin).items():
+        # Без токена доступны только публичные GET-маршруты.
+        if options.anonymous and (route['admin']
+                                  or route['method'] != 'get'):
+            continue
+        cache.clear()
+        results[name] = measure(
+            client, route['method'], route['path'], options.iterations,
+            data=route['data'], **route['kwargs'])
+
+    counter = itertools.count()
+    # Лимиты signup и token снимаются, но троттлинг остаётся в замере:
+    # иначе после первых десятка итераций замерялись бы ответы 429.
+    rates = {scope: f'{10 ** 9}/min'
+             for scope in settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']}
+    with override_settings(REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates}):
+        results['send_confcode'] = measure(
+            APIClient(), 'post', '/api/v1/auth/signup/', options.iterations,
+            data=lambda: signup_payload(next(counter)))
+        results['send_token'] = measure(
+            APIClient(), 'post', '/api/v1/auth/token/', options.iterations,
+            data=lambda: token_payload(next(counter)))
+    return {'sizes': sizes, 'routes': results,
+            'uncovered': uncovered_routes(results)}
+
+
+def uncovered_routes(results):
+    # Имена маршрутов api/urls.py, ни один путь к которым не замерялся:
+    # новый маршрут без записи в build_routes не пропадёт молча.
+    from django.urls import resolve
+
+    from api import urls
+
+    names = {pattern.name for pattern in urls.router_v1.urls}
+    names.update(
+        getattr(pattern, 'name', None) for pattern in urls.urlpatterns)
+    names.discard(None)
+    measured = {
+        resolve(result['path'].split('?')[0]).url_name
+        for result in results.values()
+    }
+    return sorted(names - measured)
+
+
+def signup_payload(idx):
+    username = f'bench_signup_{idx}'
+    return {'username': username, 'email': f'{username}@yamdb.fake'}
+
+
+def token_payload(idx):
+    from reviews.confirmation import issue_code
+    from reviews.models import User
+
+    username = f'bench_token_{idx}'
+    user = User.objects.create(
+        username=username, email=f'{username}@yamdb.fake')
+    return {'username': username, 'confirmation_code': issue_code(user)}
+
+
+def compare(report, baseline, threshold):
+    regressions = []
+    for name, current in report['routes'].items():
+        previous = baseline['routes'].get(name)
+        if previous is None:
+            continue
+        if current['p95_ms'] > previous['p95_ms'] * (1 + threshold):
+            regressions.append(
+                f'{name}: p95 {previous["p95_ms"]} -> {current["p95_ms"]} ms')
+        if current['status'] != previous['status']:
+            regressions.append(
+                f'{name}: status {previous["status"]} -> {current["status"]}')
+        if current['queries'] > previous['queries']:
+            regressions.append(
+                f'{name}: queries {previous["queries"]} -> '
+                f'{current["queries"]}')
+    return regressions
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, default=1000)
+    parser.add_argument('--genres', type=int, default=20)
+    parser.add_argument('--categories', type=int, default=5)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--reviews-per-title', type=int, default=10)
+    parser.add_argument('--comments-per-review', type=int, default=2)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument(
+        '--anonymous', action='store_true',
+        help='Запросы без токена: публичные маршруты идут через кэш.')
+    parser.add_argument('--output', help='Куда сохранить JSON-отчёт.')
+    parser.add_argument('--baseline', help='JSON-отчёт для сравнения.')
+    parser.add_argument('--threshold', type=float, default=0.2)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    setup_django()
+    with test_database():
+        report = run(options)
+    report['options'] = vars(options)
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if options.output:
+        with open(options.output, 'w', encoding='utf-8') as file:
+            file.write(output)
+    else:
+        print(output)
+    for name in report['uncovered']:
+        print(f'UNCOVERED {name}', file=sys.stderr)
+    if options.baseline:
+        with open(options.baseline, encoding='utf-8') as file:
+            regressions = compare(report, json.load(file), options.threshold)
+        for line in regressions:
+            print(f'REGRESSION {line}', file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Скорость пакетного создания произведений через POST /titles/bulk/.
+
+    python -m benchmarks.bulk_titles --titles 10000 --batch 1000
+"""
+import argparse
+import json
+import sys
+import time
+
+from benchmarks.environment import setup_django, test_database
+
+
+def run(options):
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from benchmarks.seed import seed
+    from reviews.models import Category, Genre, User
+
+    seed(titles=0, genres=options.genres, categories=options.categories,
+         users=1, reviews_per_title=0, comments_per_review=0)
+    admin = User.objects.create_user(
+        username='bench_admin', email='bench_admin@yamdb.fake', role='admin')
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(admin)}')
+    genres = list(Genre.objects.values_list('slug', flat=True))
+    categories = list(Category.objects.values_list('slug', flat=True))
+
+    started = time.perf_counter()
+    for start in range(0, options.titles, options.batch):
+        items = [
+            {'name': f'Произведение {idx}', 'year': 1900 + idx % 120,
+             'category': categories[idx % len(categories)],
+             'genre': [genres[idx % len(genres)],
+                       genres[(idx + 1) % len(genres)]]}
+            for idx in range(start, min(start + options.batch,
+                                        options.titles))
+        ]
+        response = client.post('/api/v1/titles/bulk/', data=items,
+                               format='json')
+        if response.status_code != 201:
+            raise RuntimeError(response.content.decode())
+    elapsed = time.perf_counter() - started
+    return {
+        'titles': options.titles,
+        'batch': options.batch,
+        'seconds': round(elapsed, 3),
+        'titles_per_second': round(options.titles / elapsed),
+    }
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, default=10000)
+    parser.add_argument('--batch', type=int, default=1000)
+    parser.add_argument('--genres', type=int, default=20)
+    parser.add_argument('--categories', type=int, default=5)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    setup_django()
+    with test_database():
+        report = run(options)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
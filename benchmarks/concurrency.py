@@ -0,0 +1,151 @@
+"""Пропускная способность WSGI и ASGI при одновременных запросах.
+
+    python -m benchmarks.concurrency --titles 1000 --concurrency 50
+    python -m benchmarks.concurrency --latency 5 --requests 400
+
+Сравниваются три режима на одной базе:
+  wsgi        — синхронные view, N потоков воркера;
+  asgi-sync   — те же view под ASGI (Django 3.2 выполняет их в одном
+                общем потоке);
+  asgi-async  — маршруты /api/v1/async/ с пулом ASYNC_DB_THREADS.
+--latency добавляет задержку к каждому SQL-запросу, имитируя сетевую
+базу данных: на ней и видна разница между режимами.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.api import percentile
+from benchmarks.environment import setup_django, test_database
+
+
+def add_latency(milliseconds):
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    def slow_execute(execute, sql, params, many, context):
+        time.sleep(milliseconds / 1000)
+        return execute(sql, params, many, context)
+
+    def install(sender=None, connection=None, **kwargs):
+        connection.execute_wrappers.append(slow_execute)
+
+    connection_created.connect(install, weak=False)
+    for connection in connections.all():
+        install(connection=connection)
+
+
+def paths(options, mode):
+    # Уникальный параметр запроса обходит кэш ответов: замеряется
+    # работа с базой, а не попадания в кэш.
+    return [f'{options.path}?{mode}={idx}' for idx in range(options.requests)]
+
+
+def summarize(timings, elapsed):
+    return {
+        'requests': len(timings),
+        'seconds': round(elapsed, 3),
+        'rps': round(len(timings) / elapsed, 1),
+        'p50_ms': round(percentile(timings, 0.50), 3),
+        'p95_ms': round(percentile(timings, 0.95), 3),
+    }
+
+
+def run_wsgi(options, prefix):
+    from django.test import Client
+
+    def fetch(path):
+        started = time.perf_counter()
+        response = Client().get(prefix + path)
+        assert response.status_code == 200, response.status_code
+        return (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=options.concurrency) as pool:
+        timings = list(pool.map(fetch, paths(options, 'wsgi')))
+    return summarize(timings, time.perf_counter() - started)
+
+
+async def asgi_get(application, path):
+    from asgiref.testing import ApplicationCommunicator
+
+    route, _, query = path.partition('?')
+    communicator = ApplicationCommunicator(application, {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': route,
+        'raw_path': route.encode(),
+        'query_string': query.encode(),
+        'root_path': '',
+        'headers': [(b'host', b'testserver')],
+        'client': ('127.0.0.1', 0),
+        'server': ('testserver', 80),
+    })
+    started = time.perf_counter()
+    await communicator.send_input({'type': 'http.request', 'body': b''})
+    start = await communicator.receive_output(60)
+    assert start['status'] == 200, start['status']
+    while (await communicator.receive_output(60)).get('more_body'):
+        pass
+    return (time.perf_counter() - started) * 1000
+
+
+def run_asgi(options, prefix):
+    from django.core.asgi import get_asgi_application
+
+    application = get_asgi_application()
+
+    async def main():
+        limit = asyncio.Semaphore(options.concurrency)
+
+        async def fetch(path):
+            async with limit:
+                return await asgi_get(application, prefix + path)
+
+        return await asyncio.gather(*map(fetch, paths(options, prefix)))
+
+    started = time.perf_counter()
+    timings = asyncio.run(main())
+    return summarize(timings, time.perf_counter() - started)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, default=1000)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--path', default='titles/',
+                        help='Маршрут относительно /api/v1/.')
+    parser.add_argument('--latency', type=float, default=0,
+                        help='Задержка каждого SQL-запроса, мс.')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    setup_django()
+    with test_database():
+        from benchmarks.seed import seed
+
+        seed(titles=options.titles, reviews_per_title=2,
+             comments_per_review=1)
+        if options.latency:
+            add_latency(options.latency)
+        report = {
+            'wsgi': run_wsgi(options, '/api/v1/'),
+            'asgi-sync': run_asgi(options, '/api/v1/'),
+            'asgi-async': run_asgi(options, '/api/v1/async/'),
+            'options': vars(options),
+        }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
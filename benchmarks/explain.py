@@ -0,0 +1,122 @@
+"""EXPLAIN-планы запросов списков API на заполненной тестовой базе.
+
+    python -m benchmarks.explain --titles 20000
+    python -m benchmarks.explain --titles 20000 --check
+
+Запросы собираются теми же viewset'ами и фильтрами, что обслуживают
+API, и обрезаются до первой страницы. С --check скрипт завершается с
+кодом 1, если какой-либо план читает таблицу целиком или сортирует
+результат во временном дереве вместо индекса.
+"""
+import argparse
+import sys
+
+from benchmarks.environment import setup_django, test_database
+
+# Признаки плохого плана в выводе EXPLAIN QUERY PLAN (SQLite)
+# и EXPLAIN (PostgreSQL).
+WARNINGS = (
+    'USE TEMP B-TREE FOR ORDER BY',
+    'Seq Scan',
+    'Sort',
+)
+# Фильтр по жанру идёт через связующую таблицу: отобрать произведения
+# жанра и отсортировать их дешевле, чем обходить индекс по названию.
+EXPECTED_SORTS = {'titles?genre'}
+
+
+def view_queryset(viewset, params=None, **kwargs):
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    request = Request(APIRequestFactory().get('/', params or {}))
+    view = viewset(action='list', detail=False, kwargs=kwargs,
+                   request=request, format_kwarg=None)
+    return view.filter_queryset(view.get_queryset())
+
+
+def build_queries():
+    from api.views import CommentViewSet, ReviewViewSet, TitleViewSet
+    from reviews.models import Category, Genre, Review, Title
+
+    title = Title.objects.order_by('pk').first()
+    review = Review.objects.filter(title=title).order_by('pk').first()
+    category = Category.objects.order_by('pk').first()
+    genre = Genre.objects.order_by('pk').first()
+    return {
+        'titles': view_queryset(TitleViewSet),
+        'titles?year': view_queryset(TitleViewSet, {'year': title.year}),
+        'titles?name': view_queryset(TitleViewSet, {'name': title.name}),
+        'titles?category': view_queryset(
+            TitleViewSet, {'category': category.slug}),
+        'titles?genre': view_queryset(TitleViewSet, {'genre': genre.slug}),
+        'titles?category&year': view_queryset(
+            TitleViewSet, {'category': category.slug, 'year': title.year}),
+        'reviews': view_queryset(ReviewViewSet, title_id=title.pk),
+        'comments': view_queryset(
+            CommentViewSet, title_id=title.pk, review_id=review.pk),
+    }
+
+
+def explain(queries, page_size):
+    return {
+        name: queryset[:page_size].explain()
+        for name, queryset in queries.items()
+    }
+
+
+def is_warning(line):
+    # SQLite: «SCAN таблица» без «USING INDEX» — полный проход таблицы.
+    if 'SCAN' in line.split() and 'USING' not in line:
+        return True
+    return any(warning in line for warning in WARNINGS)
+
+
+def find_warnings(plans):
+    return [
+        f'{name}: {line.strip()}'
+        for name, plan in plans.items()
+        if name not in EXPECTED_SORTS
+        for line in plan.splitlines()
+        if is_warning(line)
+    ]
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, default=20000)
+    parser.add_argument('--genres', type=int, default=50)
+    parser.add_argument('--categories', type=int, default=20)
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--reviews-per-title', type=int, default=5)
+    parser.add_argument('--comments-per-review', type=int, default=1)
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument(
+        '--check', action='store_true',
+        help='Код возврата 1, если план без подходящего индекса.')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    setup_django()
+    with test_database() as connection:
+        from benchmarks.seed import seed
+
+        seed(titles=options.titles, genres=options.genres,
+             categories=options.categories, users=options.users,
+             reviews_per_title=options.reviews_per_title,
+             comments_per_review=options.comments_per_review)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        plans = explain(build_queries(), options.page_size)
+    for name, plan in plans.items():
+        print(f'== {name}\n{plan}\n')
+    warnings = find_warnings(plans)
+    for line in warnings:
+        print(f'WARNING {line}', file=sys.stderr)
+    return 1 if options.check and warnings else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
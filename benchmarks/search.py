@@ -0,0 +1,78 @@
+"""Задержка поиска по произведениям при росте каталога.
+
+    python -m benchmarks.search --titles 2000 8000 32000
+
+Для каждого размера создаётся отдельная база. Замеряются два запроса:
+selective — слово из пяти произведений, которые добавляются в каждый
+каталог (время не должно расти с каталогом); broad — слово, которое есть
+во всех названиях (растёт линейно: COUNT и сортировка по rank всех
+совпадений, но без повторного MATCH на каждую строку).
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from benchmarks.environment import setup_django, test_database
+
+TERMS = {'selective': 'звёздные', 'broad': 'произведение'}
+MARKED_TITLES = 5
+
+
+def measure(client, term, repeat):
+    timings = []
+    for idx in range(repeat):
+        started = time.perf_counter()
+        # Уникальный параметр обходит кэш ответов.
+        response = client.get('/api/v1/titles/',
+                              {'search': term, 'request': idx})
+        timings.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, response.status_code
+    return {
+        'count': response.json()['count'],
+        'median_ms': round(statistics.median(timings), 3),
+    }
+
+
+def run(titles, repeat):
+    from django.core.cache import caches
+    from django.test import Client
+
+    from benchmarks.seed import seed
+    from reviews.models import Title
+    from reviews.search import index_titles
+
+    for cache in caches.all():
+        cache.clear()
+    seed(titles=titles, users=1, reviews_per_title=0, comments_per_review=0)
+    Title.objects.filter(pk__lte=MARKED_TITLES).update(
+        name='Звёздные войны')
+    index_titles(Title.objects.select_related('category').prefetch_related(
+        'genre').filter(pk__lte=MARKED_TITLES))
+    client = Client()
+    return {name: measure(client, term, repeat)
+            for name, term in TERMS.items()}
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, nargs='+',
+                        default=[2000, 8000, 32000])
+    parser.add_argument('--repeat', type=int, default=20)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    setup_django()
+    report = {}
+    for titles in options.titles:
+        with test_database():
+            report[titles] = run(titles, options.repeat)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
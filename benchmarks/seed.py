@@ -0,0 +1,78 @@
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection
+
+BATCH_SIZE = 1000
+
+
+def seed(titles=1000, genres=20, categories=5, users=200,
+         reviews_per_title=10, comments_per_review=2, seed_value=0):
+    from reviews.models import Category, Comment, Genre, Review, Title, User
+    from reviews.facets import rebuild_facets
+    from reviews.ratings import rebuild_ratings
+    from reviews.search import rebuild_index
+
+    rng = random.Random(seed_value)
+    password = make_password(None)
+    User.objects.bulk_create((
+        User(pk=pk, username=f'user{pk}', email=f'user{pk}@yamdb.fake',
+             password=password)
+        for pk in range(1, users + 1)
+    ), BATCH_SIZE)
+    Category.objects.bulk_create(
+        Category(pk=pk, name=f'Категория {pk}', slug=f'category-{pk}')
+        for pk in range(1, categories + 1)
+    )
+    Genre.objects.bulk_create(
+        Genre(pk=pk, name=f'Жанр {pk}', slug=f'genre-{pk}')
+        for pk in range(1, genres + 1)
+    )
+    Title.objects.bulk_create((
+        Title(pk=pk, name=f'Произведение {pk}', year=rng.randint(1900, 2020),
+              description=f'Описание произведения {pk}',
+              category_id=rng.randint(1, categories))
+        for pk in range(1, titles + 1)
+    ), BATCH_SIZE)
+    Title.genre.through.objects.bulk_create((
+        Title.genre.through(title_id=title_id, genre_id=genre_id)
+        for title_id in range(1, titles + 1)
+        for genre_id in rng.sample(range(1, genres + 1), min(2, genres))
+    ), BATCH_SIZE)
+
+    reviews_per_title = min(reviews_per_title, users)
+    Review.objects.bulk_create((
+        Review(pk=(title_id - 1) * reviews_per_title + idx + 1,
+               title_id=title_id, author_id=author_id,
+               text=f'Отзыв {idx} на произведение {title_id}',
+               score=rng.randint(1, 10))
+        for title_id in range(1, titles + 1)
+        for idx, author_id in enumerate(
+            rng.sample(range(1, users + 1), reviews_per_title))
+    ), BATCH_SIZE)
+    reviews = titles * reviews_per_title
+    Comment.objects.bulk_create((
+        Comment(review_id=review_id, author_id=rng.randint(1, users),
+                text=f'Комментарий {idx} к отзыву {review_id}')
+        for review_id in range(1, reviews + 1)
+        for idx in range(comments_per_review)
+    ), BATCH_SIZE)
+    # Строки вставлены с явными pk: на PostgreSQL последовательности
+    # сдвигаются за них, иначе следующий create() получит занятый id.
+    statements = connection.ops.sequence_reset_sql(
+        no_style(), [User, Category, Genre, Title, Review, Comment])
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+    rebuild_ratings()
+    rebuild_index()
+    rebuild_facets()
+    return {
+        'titles': titles,
+        'genres': genres,
+        'categories': categories,
+        'users': users,
+        'reviews': reviews,
+        'comments': reviews * comments_per_review,
+    }
@@ -0,0 +1,76 @@
+"""Время сериализации списков без учёта запросов к базе.
+
+    python -m benchmarks.serializers --items 100 --repeat 200
+
+Объекты загружаются заранее теми же запросами, что и в view; замеряется
+только создание сериализатора и .data на каждые --items объектов.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from benchmarks.environment import setup_django, test_database
+
+
+def measure(serializer_class, objects, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        serializer_class(objects, many=True).data
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        'items': len(objects),
+        'median_ms': round(statistics.median(timings), 3),
+        'min_ms': round(min(timings), 3),
+    }
+
+
+def run(options):
+    from api.serializers import (CategorySerializer, CommentSerializer,
+                                 GenreSerializer, ReviewSerializer,
+                                 TitleGetSerializer)
+    from api.views import CommentViewSet, ReviewViewSet, TitleViewSet
+    from benchmarks.seed import seed
+    from reviews.models import Category, Comment, Genre, Review
+
+    seed(titles=options.items, genres=options.items,
+         categories=options.items, users=20, reviews_per_title=1,
+         comments_per_review=1)
+    limit = options.items
+    titles = list(TitleViewSet.queryset[:limit])
+    reviews = list(Review.objects.select_related('author').only(
+        *ReviewViewSet.only_fields)[:limit])
+    comments = list(Comment.objects.select_related('author').only(
+        *CommentViewSet.only_fields)[:limit])
+    return {
+        'titles': measure(TitleGetSerializer, titles, options.repeat),
+        'reviews': measure(ReviewSerializer, reviews, options.repeat),
+        'comments': measure(CommentSerializer, comments, options.repeat),
+        'genres': measure(GenreSerializer, list(Genre.objects.all()[:limit]),
+                          options.repeat),
+        'categories': measure(CategorySerializer,
+                              list(Category.objects.all()[:limit]),
+                              options.repeat),
+    }
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=200)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    setup_django()
+    with test_database():
+        report = run(options)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
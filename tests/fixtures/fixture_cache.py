@@ -0,0 +1,13 @@
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from reviews.user_cache import clear_users
+
+    cache.clear()
+    clear_users()
+    yield
+    cache.clear()
+    clear_users()
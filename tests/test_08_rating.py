@@ -0,0 +1,103 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08RatingAggregates:
+
+    def test_01_rating_follows_review_changes(self, admin_client, user_client,
+                                              moderator_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/reviews/'
+        create_single_review(user_client, title_id, 'Хорошо', 8)
+        response = create_single_review(
+            moderator_client, title_id, 'Плохо', 2
+        )
+        review_id = response.json()['id']
+
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (10, 2), (
+            'Проверьте, что при создании отзыва обновляются сохранённые '
+            'сумма и количество оценок произведения.'
+        )
+
+        response = moderator_client.patch(
+            f'{url}{review_id}/', data={'score': 6}
+        )
+        assert response.status_code == HTTPStatus.OK
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (14, 2), (
+            'Проверьте, что при изменении оценки отзыва пересчитывается '
+            'сохранённая сумма оценок произведения.'
+        )
+        response = admin_client.get(f'/api/v1/titles/{title_id}/')
+        assert response.json().get('rating') == 7
+
+        response = moderator_client.delete(f'{url}{review_id}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (8, 1), (
+            'Проверьте, что при удалении отзыва его оценка вычитается из '
+            'сохранённых агрегатов произведения.'
+        )
+
+    def test_02_rebuild_ratings_command(self, admin_client, user_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Отлично', 9)
+        Title.objects.filter(pk=title_id).update(rating_sum=0, rating_count=0)
+
+        with pytest.raises(CommandError):
+            call_command('rebuild_ratings', '--check')
+
+        call_command('rebuild_ratings')
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (9, 1), (
+            'Проверьте, что команда `rebuild_ratings` пересчитывает '
+            'агрегаты оценок по отзывам.'
+        )
+        call_command('rebuild_ratings', '--check')
+
+    def test_03_concurrent_destroy_and_update(self, admin_client,
+                                              user_client, moderator_client):
+        from api.serializers import ReviewSerializer
+        from api.views import ReviewViewSet
+        from reviews.models import Review, Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review_id = create_single_review(
+            user_client, title_id, 'Хорошо', 8).json()['id']
+        other_id = create_single_review(
+            moderator_client, title_id, 'Плохо', 2).json()['id']
+
+        first, second = (Review.objects.get(pk=other_id) for _ in range(2))
+        view = ReviewViewSet()
+        view.perform_destroy(first)
+        view.perform_destroy(second)
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (8, 1), (
+            'Проверьте, что повторное удаление одного отзыва (параллельные '
+            'DELETE) не вычитает его оценку дважды.'
+        )
+
+        stale = Review.objects.get(pk=review_id)
+        Review.objects.filter(pk=review_id).update(score=5)
+        Title.objects.filter(pk=title_id).update(rating_sum=5)
+        serializer = ReviewSerializer(stale, data={'score': 10}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        view.perform_update(serializer)
+        title.refresh_from_db()
+        assert title.rating_sum == 10, (
+            'Проверьте, что изменение оценки считает разницу от оценки в '
+            'базе, а не от загруженной до транзакции.'
+        )
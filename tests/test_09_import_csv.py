@@ -0,0 +1,40 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09ImportCSV:
+
+    def test_01_import_static_data(self):
+        from reviews.models import Comment, Review, Title, User
+
+        call_command('import_csv', '--batch-size', '10')
+        assert Title.objects.count() == 32, (
+            'Проверьте, что команда `import_csv` загружает все произведения '
+            'из `static/data/titles.csv`.'
+        )
+        assert Title.genre.through.objects.count() == 42
+        assert Review.objects.count() == 72, (
+            'Проверьте, что команда `import_csv` корректно читает '
+            'многострочные тексты отзывов из `static/data/review.csv`.'
+        )
+        assert Comment.objects.count() == 3
+        assert User.objects.get(pk=101).role == 'admin'
+
+        review = Review.objects.get(pk=1)
+        assert '\n' in review.text
+        title = Title.objects.get(pk=review.title_id)
+        assert title.rating_count == title.reviews.count(), (
+            'Проверьте, что после загрузки отзывов пересчитываются '
+            'рейтинги произведений.'
+        )
+
+    def test_02_import_is_repeatable(self):
+        from reviews.models import Review
+
+        call_command('import_csv')
+        call_command('import_csv')
+        assert Review.objects.count() == 72, (
+            'Проверьте, что повторный запуск `import_csv` пропускает уже '
+            'загруженные строки.'
+        )
@@ -0,0 +1,50 @@
+import pytest
+from rest_framework.pagination import PageNumberPagination
+
+
+def create_titles_bulk(count):
+    from reviews.models import Category, Genre, Title
+
+    category = Category.objects.create(name='Фильм', slug='films')
+    genres = [
+        Genre.objects.create(name='Ужасы', slug='horror'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+    titles = [
+        Title.objects.create(name=f'Title {idx}', year=2000,
+                             category=category)
+        for idx in range(count)
+    ]
+    for title in titles:
+        title.genre.set(genres)
+    return titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10TitleQueries:
+
+    @pytest.mark.parametrize('page_size', [20, 100])
+    def test_01_title_list_queries(self, client, monkeypatch,
+                                   django_assert_max_num_queries, page_size):
+        monkeypatch.setattr(PageNumberPagination, 'page_size', page_size)
+        create_titles_bulk(page_size)
+
+        with django_assert_max_num_queries(3):
+            response = client.get('/api/v1/titles/')
+        data = response.json()
+        assert len(data['results']) == page_size
+        assert all(
+            len(title['genre']) == 2 and title['category']
+            for title in data['results']
+        ), (
+            'Проверьте, что ответ на GET-запрос к `/api/v1/titles/` '
+            'содержит жанры и категорию каждого произведения.'
+        )
+
+    def test_02_title_detail_queries(self, client,
+                                     django_assert_max_num_queries):
+        title = create_titles_bulk(1)[0]
+
+        with django_assert_max_num_queries(2):
+            response = client.get(f'/api/v1/titles/{title.id}/')
+        assert len(response.json()['genre']) == 2
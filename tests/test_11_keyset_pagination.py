@@ -0,0 +1,70 @@
+from http import HTTPStatus
+
+import pytest
+
+
+def create_reviews_bulk(count):
+    from reviews.models import Category, Review, Title, User
+
+    category = Category.objects.create(name='Фильм', slug='films')
+    title = Title.objects.create(name='Терминатор', year=1984,
+                                 category=category)
+    for idx in range(count):
+        author = User.objects.create_user(
+            username=f'author_{idx}', email=f'author_{idx}@yamdb.fake'
+        )
+        Review.objects.create(title=title, author=author,
+                              text=f'review {idx}', score=5)
+    return title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11KeysetPagination:
+
+    def test_01_cursor_walks_all_reviews(self, client):
+        title = create_reviews_bulk(25)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+
+        response = client.get(url, {'pagination': 'cursor'})
+        assert response.status_code == HTTPStatus.OK
+        first_page = response.json()
+        assert 'count' not in first_page, (
+            'Проверьте, что при `?pagination=cursor` ответ не содержит '
+            '`count` и не требует подсчёта всех строк.'
+        )
+        assert first_page['previous'] is None
+        assert len(first_page['results']) == 20
+
+        response = client.get(first_page['next'])
+        second_page = response.json()
+        assert len(second_page['results']) == 5
+        assert second_page['next'] is None
+
+        ids = [review['id'] for review in first_page['results']]
+        ids += [review['id'] for review in second_page['results']]
+        assert ids == sorted(ids, reverse=True), (
+            'Проверьте, что страницы по курсору упорядочены по '
+            '(`pub_date`, `id`) без пропусков и повторов.'
+        )
+        assert len(set(ids)) == 25
+
+        response = client.get(second_page['previous'])
+        assert response.json()['results'] == first_page['results'], (
+            'Проверьте, что ссылка `previous` возвращает предыдущую '
+            'страницу по курсору.'
+        )
+
+    def test_02_page_numbers_by_default(self, client):
+        title = create_reviews_bulk(3)
+        response = client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert response.json()['count'] == 3, (
+            'Проверьте, что без параметра `pagination` сохраняется '
+            'постраничный вывод по номерам страниц.'
+        )
+
+    def test_03_invalid_cursor(self, client):
+        title = create_reviews_bulk(1)
+        response = client.get(
+            f'/api/v1/titles/{title.id}/reviews/', {'cursor': 'broken'}
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,113 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+def search(client, term):
+    response = client.get('/api/v1/titles/', {'search': term})
+    assert response.status_code == HTTPStatus.OK
+    return [title['name'] for title in response.json()['results']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleSearch:
+
+    def test_01_search_by_name_genre_and_category(self, admin_client,
+                                                  client):
+        create_titles(admin_client)
+
+        assert search(client, 'терминатор') == ['Терминатор'], (
+            'Проверьте, что поиск по `?search=` находит произведение по '
+            'названию без учёта регистра.'
+        )
+        assert search(client, 'крепк') == ['Крепкий орешек'], (
+            'Проверьте, что поиск по `?search=` находит произведения по '
+            'началу слова.'
+        )
+        assert search(client, 'Драма') == ['Крепкий орешек'], (
+            'Проверьте, что поиск по `?search=` учитывает жанры.'
+        )
+        assert search(client, 'Книги') == ['Крепкий орешек']
+        assert search(client, 'мюзикл') == []
+
+    def test_02_index_follows_title_changes(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+
+        admin_client.patch(url, data={'name': 'Робокоп', 'genre': ['drama']})
+        assert search(client, 'терминатор') == []
+        assert search(client, 'робокоп') == ['Робокоп']
+        assert sorted(search(client, 'драма')) == [
+            'Крепкий орешек', 'Робокоп'
+        ], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'жанров произведения.'
+        )
+
+        admin_client.delete(url)
+        assert search(client, 'робокоп') == [], (
+            'Проверьте, что удалённое произведение пропадает из поиска.'
+        )
+
+    def test_03_name_match_ranks_first(self, admin_client, client):
+        from reviews.models import Title
+
+        create_titles(admin_client)
+        Title.objects.create(name='Ужасы Парижа', year=2000)
+        assert search(client, 'ужасы')[0] == 'Ужасы Парижа', (
+            'Проверьте, что совпадение в названии ранжируется выше '
+            'совпадения в жанре.'
+        )
+
+    def test_04_rebuild_search_index(self, admin_client):
+        from reviews.models import Title
+
+        create_titles(admin_client)
+        Title.objects.filter(name='Терминатор').update(name='Чужой')
+        assert search(admin_client, 'чужой') == []
+
+        call_command('rebuild_search_index')
+        assert search(admin_client, 'чужой') == ['Чужой']
+
+    @pytest.mark.skipif(connection.vendor != 'sqlite', reason='только SQLite')
+    def test_05_match_runs_once(self, admin_client, client):
+        create_titles(admin_client)
+        with CaptureQueriesContext(connection) as context:
+            search(client, 'драма')
+        searches = [query['sql'] for query in context.captured_queries
+                    if 'MATCH' in query['sql']]
+        assert searches, 'Проверьте, что поиск использует индекс FTS5.'
+        for sql in searches:
+            assert sql.count('MATCH') == 1 and 'SELECT rank' not in sql, (
+                'Проверьте, что MATCH выполняется один раз на запрос, а не '
+                'в подзапросе для каждой строки: иначе поиск замедляется '
+                'квадратично с ростом каталога.'
+            )
+
+    def test_06_index_follows_genre_and_category(self, admin_client, client):
+        from reviews.models import Genre
+
+        create_titles(admin_client)
+        genre = Genre.objects.get(slug='drama')
+        genre.name = 'Триллер'
+        genre.save()
+        assert search(client, 'триллер') == ['Крепкий орешек'], (
+            'Проверьте, что переименование жанра обновляет поисковый индекс.'
+        )
+        assert search(client, 'драма') == []
+
+        admin_client.delete('/api/v1/genres/drama/')
+        admin_client.delete('/api/v1/categories/books/')
+        assert search(client, 'триллер') == [], (
+            'Проверьте, что удалённый жанр пропадает из поискового индекса.'
+        )
+        assert search(client, 'книги') == [], (
+            'Проверьте, что удалённая категория пропадает из поискового '
+            'индекса.'
+        )
+        assert search(client, 'крепкий') == ['Крепкий орешек']
@@ -0,0 +1,61 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ResponseCache:
+
+    def test_01_anonymous_list_is_cached(self, admin_client, client,
+                                         django_assert_num_queries):
+        from api.cache import get_stats
+
+        create_titles(admin_client)
+        hits_before = get_stats().get(('titles', 'hit'), 0)
+        first = client.get('/api/v1/titles/', {'year': 1984, 'name': 'Т'})
+        with django_assert_num_queries(0):
+            second = client.get(
+                '/api/v1/titles/', {'name': 'Т', 'year': 1984}
+            )
+        assert second.status_code == HTTPStatus.OK
+        assert second.json() == first.json(), (
+            'Проверьте, что повторный анонимный GET-запрос к '
+            '`/api/v1/titles/` отдаётся из кэша, а порядок параметров '
+            'запроса не влияет на ключ кэша.'
+        )
+        assert get_stats()[('titles', 'hit')] == hits_before + 1
+
+    def test_02_writes_invalidate_cache(self, admin_client, client,
+                                        user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        reviews_url = f'{title_url}reviews/'
+
+        assert client.get(title_url).json()['rating'] is None
+        assert client.get(reviews_url).json()['count'] == 0
+
+        create_single_review(user_client, titles[0]['id'], 'Отлично', 9)
+        assert client.get(reviews_url).json()['count'] == 1, (
+            'Проверьте, что создание отзыва сбрасывает кэш списка отзывов.'
+        )
+        assert client.get(title_url).json()['rating'] == 9, (
+            'Проверьте, что создание отзыва сбрасывает кэш произведений, '
+            'так как меняется рейтинг.'
+        )
+
+        genres_count = client.get('/api/v1/genres/').json()['count']
+        admin_client.post('/api/v1/genres/', data={
+            'name': 'Мюзикл', 'slug': 'musical'
+        })
+        assert client.get('/api/v1/genres/').json()['count'] == (
+            genres_count + 1
+        )
+
+    def test_03_authenticated_requests_bypass_cache(self, admin_client):
+        create_titles(admin_client)
+        admin_client.get('/api/v1/titles/')
+        from reviews.models import Title
+        Title.objects.all().delete()
+        assert admin_client.get('/api/v1/titles/').json()['count'] == 0
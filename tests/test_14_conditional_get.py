@@ -0,0 +1,111 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ConditionalGet:
+
+    def test_01_title_detail_not_modified(self, admin_client, client,
+                                          django_assert_max_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+
+        response = client.get(url)
+        etag = response.get('ETag')
+        assert etag and not etag.startswith('W/'), (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'сильный ETag.'
+        )
+        assert response.get('Last-Modified')
+
+        with django_assert_max_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает 304 без обращения к базе.'
+        )
+        assert response.get('ETag') == etag
+
+        admin_client.patch(url, data={'name': 'Терминатор 2'})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['name'] == 'Терминатор 2'
+        assert response.get('ETag') != etag
+
+    def test_02_review_and_comment_lists(self, admin_client, client,
+                                         user_client):
+        titles, _, _ = create_titles(admin_client)
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+
+        etag = client.get(reviews_url).get('ETag')
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        review = create_single_review(
+            user_client, titles[0]['id'], 'Отлично', 9
+        ).json()
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после добавления отзыва ETag списка отзывов '
+            'меняется.'
+        )
+
+        comments_url = f'{reviews_url}{review["id"]}/comments/'
+        etag = client.get(comments_url).get('ETag')
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    @pytest.mark.parametrize('url', ['/api/v1/genres/', '/api/v1/categories/'])
+    def test_03_genre_and_category_lists(self, admin_client, client, url):
+        create_titles(admin_client)
+        response = client.get(url)
+        last_modified = response.get('Last-Modified')
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с `If-Modified-Since` '
+            'возвращает 304, если данные не менялись.'
+        )
+
+    def test_04_title_detail_versioned_per_title(self, admin_client, client,
+                                                  user_client):
+        from django.core.cache import caches
+
+        from reviews.models import Genre
+
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        etag = client.get(url).get('ETag')
+
+        create_single_review(user_client, titles[1]['id'], 'Неплохо', 6)
+        admin_client.post('/api/v1/genres/',
+                          data={'name': 'Мюзикл', 'slug': 'musical'})
+        for cache in caches.all():
+            cache.clear()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что ETag `{url}` не меняется от записей в другие '
+            'произведения и справочники и не истекает вместе с кэшем.'
+        )
+
+        create_single_review(user_client, titles[0]['id'], 'Отлично', 9)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что отзыв к произведению меняет ETag его карточки.'
+        )
+        assert response.json()['rating'] == 9
+
+        etag = response.get('ETag')
+        genre = Genre.objects.get(slug=titles[0]['genre'][0])
+        genre.name = 'Чёрная комедия'
+        genre.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что переименование жанра меняет ETag карточек '
+            'его произведений, в том числе при записи через ORM.'
+        )
+        assert 'Чёрная комедия' in [
+            item['name'] for item in response.json()['genre']
+        ]
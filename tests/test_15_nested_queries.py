@@ -0,0 +1,149 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_comment, create_single_review
+
+
+def create_title(slug='films'):
+    from reviews.models import Category, Genre, Title
+
+    title = Title.objects.create(
+        name='Терминатор', year=1984,
+        category=Category.objects.create(name=slug, slug=slug)
+    )
+    title.genre.add(Genre.objects.create(name=slug, slug=slug))
+    return title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15NestedRouteQueries:
+
+    def test_01_review_actions(self, user_client,
+                               django_assert_max_num_queries):
+        title = create_title()
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        data = {'text': 'Отлично', 'score': 9}
+
+        with django_assert_max_num_queries(5):
+            response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        review_url = f'{url}{response.json()["id"]}/'
+
+        with django_assert_max_num_queries(4):
+            response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв отклоняется ограничением '
+            '`unique_author_review` без предварительной проверки.'
+        )
+
+        with django_assert_max_num_queries(5):
+            response = user_client.get(url)
+        assert response.json()['count'] == 1
+
+        with django_assert_max_num_queries(3):
+            response = user_client.get(review_url)
+        assert response.status_code == HTTPStatus.OK
+
+        with django_assert_max_num_queries(6):
+            response = user_client.patch(review_url, data={'score': 7})
+        assert response.status_code == HTTPStatus.OK
+
+        with django_assert_max_num_queries(7):
+            response = user_client.delete(review_url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+
+    def test_02_comment_actions(self, user_client,
+                                django_assert_max_num_queries):
+        title = create_title()
+        review_id = create_single_review(
+            user_client, title.id, 'Отлично', 9
+        ).json()['id']
+        url = f'/api/v1/titles/{title.id}/reviews/{review_id}/comments/'
+
+        with django_assert_max_num_queries(3):
+            response = user_client.post(url, data={'text': 'Согласен'})
+        assert response.status_code == HTTPStatus.CREATED
+        comment_url = f'{url}{response.json()["id"]}/'
+
+        with django_assert_max_num_queries(5):
+            response = user_client.get(url)
+        assert response.json()['count'] == 1
+
+        with django_assert_max_num_queries(3):
+            response = user_client.get(comment_url)
+        assert response.status_code == HTTPStatus.OK
+
+        with django_assert_max_num_queries(4):
+            response = user_client.patch(comment_url, data={'text': 'Нет'})
+        assert response.status_code == HTTPStatus.OK
+
+        with django_assert_max_num_queries(4):
+            response = user_client.delete(comment_url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+
+    def test_03_comment_review_must_belong_to_title(self, user_client):
+        first, second = create_title(), create_title('books')
+        review_id = create_single_review(
+            user_client, first.id, 'Отлично', 9
+        ).json()['id']
+        create_single_comment(user_client, first.id, review_id, 'Да')
+
+        url = f'/api/v1/titles/{second.id}/reviews/{review_id}/comments/'
+        assert user_client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что комментарии отзыва недоступны по адресу '
+            'другого произведения.'
+        )
+        response = user_client.post(url, data={'text': 'Нет'})
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_list_queries_do_not_grow_with_page(self, client):
+        from django.core.cache import cache
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from reviews.models import Comment, Review, User
+        from reviews.user_cache import clear_users
+
+        title = create_title()
+        authors = [
+            User.objects.create(username=f'author{idx}',
+                                email=f'author{idx}@yamdb.fake')
+            for idx in range(10)
+        ]
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+
+        def count_queries(url):
+            cache.clear()
+            clear_users()
+            with CaptureQueriesContext(connection) as captured:
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            return len(captured), response.json()['results']
+
+        review = Review.objects.create(
+            title=title, author=authors[0], text='Первый', score=5)
+        comments_url = f'{reviews_url}{review.id}/comments/'
+        Comment.objects.create(review=review, author=authors[0], text='Да')
+        single_review, _ = count_queries(reviews_url)
+        single_comment, _ = count_queries(comments_url)
+
+        for author in authors[1:]:
+            Review.objects.create(
+                title=title, author=author, text='Ещё', score=5)
+            Comment.objects.create(review=review, author=author, text='Да')
+        many_reviews, results = count_queries(reviews_url)
+        assert len(results) == 10
+        assert {item['author'] for item in results} == {
+            author.username for author in authors
+        }
+        assert many_reviews == single_review, (
+            'Проверьте, что число запросов к списку отзывов не зависит от '
+            'числа отзывов на странице.'
+        )
+        many_comments, results = count_queries(comments_url)
+        assert len(results) == 10
+        assert many_comments == single_comment, (
+            'Проверьте, что число запросов к списку комментариев не '
+            'зависит от числа комментариев на странице.'
+        )
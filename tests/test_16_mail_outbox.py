@@ -0,0 +1,126 @@
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16MailOutbox:
+    url_signup = '/api/v1/auth/signup/'
+
+    def test_01_signup_queues_mail(self, client, settings):
+        from reviews.models import OutgoingEmail
+
+        settings.EMAIL_OUTBOX_EAGER = False
+        outbox_before_count = len(mail.outbox)
+        response = client.post(self.url_signup, data={
+            'email': 'valid@yamdb.fake', 'username': 'valid_username'
+        })
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == outbox_before_count, (
+            f'Проверьте, что POST-запрос к `{self.url_signup}` не '
+            'отправляет письмо синхронно, а ставит его в очередь.'
+        )
+        assert OutgoingEmail.objects.filter(sent__isnull=True).count() == 1
+
+        call_command('send_queued_mail', '--once')
+        assert len(mail.outbox) == outbox_before_count + 1
+        assert mail.outbox[-1].to == ['valid@yamdb.fake']
+        assert not OutgoingEmail.objects.filter(sent__isnull=True).exists()
+
+    def test_02_failed_mail_is_retried_later(self, monkeypatch, settings):
+        from reviews.models import OutgoingEmail
+        from reviews.outbox import queue_mail, send_pending
+
+        def broken_send(self, messages):
+            raise ConnectionError('SMTP недоступен')
+
+        settings.EMAIL_OUTBOX_EAGER = False
+        queue_mail('Тема', 'Текст', 'from@yamdb.fake', ['to@yamdb.fake'])
+        monkeypatch.setattr(EmailBackend, 'send_messages', broken_send)
+        assert send_pending() == 0
+
+        email = OutgoingEmail.objects.get()
+        assert email.attempts == 1
+        assert 'SMTP' in email.last_error
+        assert send_pending() == 0, (
+            'Проверьте, что письмо после ошибки откладывается до '
+            '`next_attempt`.'
+        )
+
+        monkeypatch.undo()
+        OutgoingEmail.objects.update(next_attempt=email.created)
+        assert send_pending() == 1
+
+    def test_03_claimed_mail_is_sent_once(self, settings):
+        from reviews.models import OutgoingEmail
+        from reviews.outbox import claim_emails, pending_emails, queue_mail
+
+        settings.EMAIL_OUTBOX_EAGER = False
+        queue_mail('Тема', 'Текст', 'from@yamdb.fake',
+                   ['one@yamdb.fake', 'two@yamdb.fake'])
+        stale = list(pending_emails())
+        claimed = claim_emails(pending_emails(), 10)
+        assert len(claimed) == 2
+        assert claim_emails(pending_emails(), 10) == [], (
+            'Проверьте, что забранные письма не видны другим отправителям.'
+        )
+        for email in stale:
+            assert not OutgoingEmail.objects.filter(
+                pk=email.pk, next_attempt=email.next_attempt
+            ).exists(), (
+                'Проверьте, что письмо забирается условным UPDATE по '
+                '`next_attempt`.'
+            )
+
+    def test_04_eager_sends_only_own_mail(self, settings):
+        from reviews.models import OutgoingEmail
+        from reviews.outbox import queue_mail
+
+        settings.EMAIL_OUTBOX_EAGER = False
+        queue_mail('Чужое', 'Текст', 'from@yamdb.fake', ['old@yamdb.fake'])
+        settings.EMAIL_OUTBOX_EAGER = True
+        outbox_before_count = len(mail.outbox)
+        queue_mail('Своё', 'Текст', 'from@yamdb.fake', ['new@yamdb.fake'])
+        assert [message.to for message in mail.outbox[
+            outbox_before_count:]] == [['new@yamdb.fake']], (
+            'Проверьте, что в режиме EAGER запрос отправляет только '
+            'созданные им письма.'
+        )
+        assert OutgoingEmail.objects.get(to='old@yamdb.fake').sent is None
+
+    def test_05_sent_mail_is_blanked_and_purged(self, client, settings):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from reviews.models import OutgoingEmail
+
+        settings.EMAIL_OUTBOX_EAGER = False
+        client.post(self.url_signup, data={
+            'email': 'valid@yamdb.fake', 'username': 'valid_username'
+        })
+        call_command('send_queued_mail', '--once')
+        assert OutgoingEmail.objects.get().body == '', (
+            'Проверьте, что после отправки код подтверждения не остаётся '
+            'в тексте письма в базе.'
+        )
+
+        old = timezone.now() - settings.EMAIL_OUTBOX_KEEP - timedelta(
+            minutes=1)
+        OutgoingEmail.objects.update(sent=old)
+        OutgoingEmail.objects.bulk_create([
+            OutgoingEmail(subject='Брошено', body='код', to='a@yamdb.fake',
+                          attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS),
+            OutgoingEmail(subject='В очереди', body='код',
+                          to='b@yamdb.fake'),
+        ])
+        OutgoingEmail.objects.filter(subject='Брошено').update(created=old)
+        call_command('purge_confirmation_codes')
+        assert list(OutgoingEmail.objects.values_list(
+            'subject', flat=True)) == ['В очереди'], (
+            'Проверьте, что `purge_confirmation_codes` удаляет старые '
+            'отправленные и брошенные письма.'
+        )
@@ -0,0 +1,80 @@
+import re
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17ConfirmationCodes:
+    url_signup = '/api/v1/auth/signup/'
+    url_token = '/api/v1/auth/token/'
+
+    def signup(self, client, username):
+        response = client.post(self.url_signup, data={
+            'email': f'{username}@yamdb.fake', 'username': username
+        })
+        assert response.status_code == HTTPStatus.OK
+        return re.search(r': (\S+)$', mail.outbox[-1].body).group(1)
+
+    def get_token(self, client, username, code):
+        return client.post(self.url_token, data={
+            'username': username, 'confirmation_code': code
+        })
+
+    def test_01_code_is_single_use(self, client):
+        from reviews.models import ConfirmationCode
+
+        code = self.signup(client, 'first_user')
+        stored = ConfirmationCode.objects.get(user__username='first_user')
+        assert stored.code_hash != code, (
+            'Проверьте, что код подтверждения хранится в виде хэша.'
+        )
+        response = self.get_token(client, 'first_user', code)
+        assert response.status_code == HTTPStatus.OK
+        assert 'token' in response.json()
+
+        response = self.get_token(client, 'first_user', code)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что код подтверждения нельзя использовать повторно.'
+        )
+
+    def test_02_code_is_bound_to_user(self, client):
+        code = self.signup(client, 'first_user')
+        self.signup(client, 'second_user')
+        response = self.get_token(client, 'second_user', code)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что код подтверждения одного пользователя не '
+            'подходит другому.'
+        )
+
+    def test_03_attempts_are_limited(self, client, settings):
+        code = self.signup(client, 'first_user')
+        for _ in range(settings.CONFIRMATION_CODE_ATTEMPTS):
+            response = self.get_token(client, 'first_user', 'wrong')
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = self.get_token(client, 'first_user', code)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что после исчерпания попыток код перестаёт '
+            'действовать.'
+        )
+
+    def test_04_expired_code_is_rejected_and_purged(self, client):
+        from reviews.models import ConfirmationCode
+
+        code = self.signup(client, 'first_user')
+        self.signup(client, 'second_user')
+        ConfirmationCode.objects.filter(
+            user__username='first_user'
+        ).update(expires_at=timezone.now() - timedelta(minutes=1))
+        response = self.get_token(client, 'first_user', code)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что просроченный код подтверждения не принимается.'
+        )
+
+        call_command('purge_confirmation_codes')
+        assert list(ConfirmationCode.objects.values_list(
+            'user__username', flat=True)) == ['second_user']
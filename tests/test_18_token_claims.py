@@ -0,0 +1,100 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+def claims_client(user):
+    from api.authentication import token_for_user
+
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {token_for_user(user)}')
+    return client
+
+
+def user_queries(captured):
+    return [query['sql'] for query in captured.captured_queries
+            if 'FROM "reviews_user"' in query['sql']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18TokenClaims:
+
+    def test_01_token_view_embeds_claims(self, client, admin):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        from reviews.confirmation import issue_code
+
+        response = client.post('/api/v1/auth/token/', data={
+            'username': admin.username,
+            'confirmation_code': issue_code(admin),
+        })
+        assert response.status_code == HTTPStatus.OK
+        token = AccessToken(response.json()['token'])
+        assert token['role'] == 'admin', (
+            'Проверьте, что токен из `/api/v1/auth/token/` содержит роль '
+            'пользователя.'
+        )
+        assert token['is_superuser'] is False
+
+    def test_02_permissions_without_user_query(self, admin):
+        client = claims_client(admin)
+        client.get('/api/v1/categories/')
+        with CaptureQueriesContext(connection) as captured:
+            response = client.post('/api/v1/categories/', data={
+                'name': 'Фильмы', 'slug': 'films'
+            })
+        assert response.status_code == HTTPStatus.CREATED
+        assert user_queries(captured) == [], (
+            'Проверьте, что токен с claims не загружает пользователя из '
+            'базы для проверки прав.'
+        )
+
+    def test_03_role_change_revokes_token(self, admin_client, user):
+        client = claims_client(user)
+        assert client.get('/api/v1/users/me/').status_code == HTTPStatus.OK
+
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'moderator'})
+        assert response.status_code == HTTPStatus.OK
+        assert client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Проверьте, что смена роли отзывает выданные токены.'
+
+        user.refresh_from_db()
+        client = claims_client(user)
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['role'] == 'moderator'
+
+    def test_04_bio_change_keeps_token(self, admin_client, user):
+        client = claims_client(user)
+        response = client.patch('/api/v1/users/me/', data={'bio': 'новое'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['email'] == user.email
+        assert client.get('/api/v1/users/me/').status_code == HTTPStatus.OK
+
+    def test_05_deleted_user_token_rejected(self, admin_client, user):
+        client = claims_client(user)
+        assert client.get('/api/v1/users/me/').status_code == HTTPStatus.OK
+
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Проверьте, что токен удалённого пользователя не принимается.'
+
+    def test_06_username_change_keeps_token(self, user):
+        client = claims_client(user)
+        response = client.patch(
+            '/api/v1/users/me/', data={'username': 'renamed_user'})
+        assert response.status_code == HTTPStatus.OK
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что смена username через `/api/v1/users/me/` не '
+            'отзывает токен: в claims только роль и is_superuser.'
+        )
+        assert response.json()['username'] == 'renamed_user'
@@ -0,0 +1,44 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews
+
+
+def user_queries(captured):
+    return [query['sql'] for query in captured.captured_queries
+            if 'FROM "reviews_user"' in query['sql']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19UserCache:
+
+    def test_01_permission_check_without_user_query(self, admin_client,
+                                                    user, user_client):
+        reviews, titles = create_reviews(admin_client, {user: user_client})
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        user_client.get(url)
+
+        with CaptureQueriesContext(connection) as captured:
+            response = user_client.patch(url, data={'text': 'Новый текст'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['author'] == reviews[0]['author']
+        assert user_queries(captured) == [], (
+            'Проверьте, что проверка прав на отзыв и вывод автора не '
+            'загружают пользователя из базы повторно.'
+        )
+
+    def test_02_username_change_invalidates_cache(self, admin_client, user,
+                                                  user_client):
+        reviews, titles = create_reviews(admin_client, {user: user_client})
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        assert admin_client.get(url).json()['author'] == user.username
+
+        user.username = 'RenamedUser'
+        user.save()
+        assert admin_client.get(url).json()['author'] == 'RenamedUser', (
+            'Проверьте, что кэш пользователей сбрасывается при сохранении '
+            'пользователя.'
+        )
@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_titles
+
+URL = '/api/v1/titles/facets/'
+
+
+def assert_counts_consistent():
+    from reviews.facets import filtered_facets, stored_facets
+    from reviews.models import Title
+
+    assert stored_facets() == filtered_facets(Title.objects.all()), (
+        'Проверьте, что сохранённые счётчики совпадают с подсчётом по '
+        'произведениям.'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20TitleFacets:
+
+    def test_01_facet_counts(self, admin_client, client,
+                             django_assert_max_num_queries):
+        create_titles(admin_client)
+
+        with django_assert_max_num_queries(3):
+            response = client.get(URL)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{URL}` доступен без токена.'
+        )
+        assert response.json() == {
+            'genre': {'comedy': 1, 'drama': 1, 'horror': 1},
+            'category': {'books': 1, 'films': 1},
+            'year': {'1984': 1, '1988': 1},
+        }
+
+    def test_02_facet_counts_follow_filters(self, admin_client, client):
+        create_titles(admin_client)
+
+        response = client.get(URL, {'genre': 'horror'})
+        assert response.json() == {
+            'genre': {'comedy': 1, 'horror': 1},
+            'category': {'films': 1},
+            'year': {'1984': 1},
+        }, (
+            f'Проверьте, что `{URL}` учитывает фильтры списка произведений.'
+        )
+        response = client.get(URL, {'search': 'крепкий'})
+        assert response.json()['category'] == {'books': 1}
+
+    def test_03_counts_follow_changes(self, admin_client):
+        from reviews.models import Genre, Title
+
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        admin_client.patch(url, data={
+            'genre': ['drama'], 'category': 'books', 'year': 1990
+        })
+        assert_counts_consistent()
+
+        title = Title.objects.get(pk=titles[1]['id'])
+        title.genre.remove(*Genre.objects.all())
+        Genre.objects.get(slug='horror').titles.add(title)
+        assert_counts_consistent()
+
+        Genre.objects.get(slug='drama').titles.clear()
+        admin_client.delete('/api/v1/categories/books/')
+        assert_counts_consistent()
+
+        admin_client.delete(url)
+        assert_counts_consistent()
+        assert admin_client.get(URL).json()['year'] == {'1988': 1}
+
+    def test_04_rebuild_facets(self, admin_client):
+        from reviews.models import FacetCount, Title
+
+        create_titles(admin_client)
+        Title.objects.update(year=2000)
+        FacetCount.objects.filter(facet=FacetCount.GENRE).delete()
+
+        call_command('rebuild_facets')
+        assert_counts_consistent()
+        assert admin_client.get(URL).json()['year'] == {'2000': 2}
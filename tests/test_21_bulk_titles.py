@@ -0,0 +1,102 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_categories, create_genre
+
+URL = '/api/v1/titles/bulk/'
+
+
+def make_items(count, **extra):
+    return [
+        {'name': f'Произведение {idx}', 'year': 2000 + idx % 20,
+         'category': 'films', 'genre': ['horror', 'comedy'], **extra}
+        for idx in range(count)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21BulkTitles:
+
+    def test_01_bulk_create(self, admin_client, client):
+        from reviews.facets import filtered_facets, stored_facets
+        from reviews.models import Title
+
+        create_genre(admin_client)
+        create_categories(admin_client)
+        response = admin_client.post(URL, data=make_items(3), format='json')
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос администратора к `{URL}` со '
+            'списком корректных произведений возвращает статус 201.'
+        )
+        data = response.json()
+        assert [title['name'] for title in data] == [
+            'Произведение 0', 'Произведение 1', 'Произведение 2'
+        ]
+        assert all(title['id'] for title in data)
+        assert data[0]['category'] == {'name': 'Фильм', 'slug': 'films'}
+        assert sorted(genre['slug'] for genre in data[0]['genre']) == [
+            'comedy', 'horror'
+        ]
+        assert Title.genre.through.objects.count() == 6
+
+        response = client.get('/api/v1/titles/', {'search': 'произведение'})
+        assert response.json()['count'] == 3, (
+            'Проверьте, что созданные пачкой произведения попадают в '
+            'поисковый индекс.'
+        )
+        assert stored_facets() == filtered_facets(Title.objects.all())
+
+    def test_02_queries_do_not_grow_with_batch(self, admin_client):
+        create_genre(admin_client)
+        create_categories(admin_client)
+
+        def count_queries(count):
+            with CaptureQueriesContext(connection) as captured:
+                response = admin_client.post(
+                    URL, data=make_items(count, year=2000), format='json')
+            assert response.status_code == HTTPStatus.CREATED
+            # Поисковый индекс SQLite заполняется построчно.
+            return len([query for query in captured.captured_queries
+                        if 'reviews_title_fts' not in query['sql']])
+
+        # Первая пачка заводит строки счётчиков фасетов.
+        count_queries(1)
+        assert count_queries(10) == count_queries(100), (
+            'Проверьте, что число запросов при пакетном создании '
+            'произведений не зависит от размера пачки.'
+        )
+
+    def test_03_per_item_errors(self, admin_client):
+        from reviews.models import Title
+
+        create_genre(admin_client)
+        create_categories(admin_client)
+        items = make_items(3)
+        items[1]['category'] = 'music'
+        items[2]['genre'] = ['horror', 'western']
+        items[2]['year'] = 3000
+        response = admin_client.post(URL, data=items, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert len(errors) == 3, (
+            'Проверьте, что ошибки возвращаются списком по одному элементу '
+            'на каждое произведение запроса.'
+        )
+        assert errors[0] == {}
+        assert set(errors[1]) == {'category'}
+        assert set(errors[2]) == {'year'}
+        assert not Title.objects.exists(), (
+            'Проверьте, что при ошибках ни одно произведение не создаётся.'
+        )
+
+        response = admin_client.post(URL, data={}, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_only_admin(self, admin_client, user_client):
+        create_genre(admin_client)
+        create_categories(admin_client)
+        response = user_client.post(URL, data=make_items(1), format='json')
+        assert response.status_code == HTTPStatus.FORBIDDEN
@@ -0,0 +1,76 @@
+import json
+from datetime import date
+from http import HTTPStatus
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from tests.utils import create_comments
+
+URL = '/api/v1/export/'
+
+
+def read_records(response):
+    content = b''.join(response.streaming_content).decode()
+    return [json.loads(line) for line in content.splitlines()]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22Export:
+
+    def test_01_export_stream(self, admin_client, admin, settings):
+        settings.EXPORT_CHUNK_SIZE = 1
+        create_comments(admin_client, {admin: admin_client})
+
+        response = admin_client.get(URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            f'Проверьте, что `{URL}` отдаёт ответ потоком.'
+        )
+        assert response['Content-Type'] == 'application/x-ndjson'
+        records = read_records(response)
+        assert [record['type'] for record in records] == [
+            'title', 'title', 'review', 'comment'
+        ]
+        title, review = records[0], records[2]
+        assert title['name'] == 'Терминатор'
+        assert title['category'] == 'films'
+        assert sorted(title['genre']) == ['comedy', 'horror']
+        assert title['rating'] == 5
+        assert review['title_id'] == title['id']
+        assert review['author'] == admin.username
+        assert records[3]['review_id'] == review['id']
+
+    def test_02_since_filters_reviews(self, admin_client, admin):
+        from reviews.models import Comment, Review
+
+        create_comments(admin_client, {admin: admin_client})
+        Review.objects.update(pub_date=date(2020, 1, 1))
+        Comment.objects.update(pub_date=date(2020, 1, 1))
+
+        records = read_records(admin_client.get(URL, {'since': '2021-01-01'}))
+        assert [record['type'] for record in records] == ['title', 'title'], (
+            f'Проверьте, что `{URL}?since=` отбрасывает отзывы и '
+            'комментарии старше указанной даты.'
+        )
+        records = read_records(admin_client.get(URL, {'since': '2020-01-01'}))
+        assert len(records) == 4
+
+        response = admin_client.get(URL, {'since': 'вчера'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_export_admin_only(self, client, user_client):
+        assert client.get(URL).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(URL).status_code == HTTPStatus.FORBIDDEN
+
+    def test_04_export_command(self, admin_client, admin, tmp_path):
+        create_comments(admin_client, {admin: admin_client})
+        output = tmp_path / 'export.ndjson'
+
+        call_command('export_ndjson', '--output', str(output))
+        lines = output.read_text(encoding='utf-8').splitlines()
+        assert [json.loads(line)['type'] for line in lines] == [
+            'title', 'title', 'review', 'comment'
+        ]
+        with pytest.raises(CommandError):
+            call_command('export_ndjson', '--since', '01.01.2020')
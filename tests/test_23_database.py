@@ -0,0 +1,50 @@
+import pytest
+from django.db import connection, connections
+
+
+@pytest.fixture
+def file_connection(tmp_path):
+    wrapper = connections['default'].__class__(
+        {**connection.settings_dict, 'NAME': str(tmp_path / 'db.sqlite3')},
+        alias='file_db')
+    yield wrapper
+    wrapper.close()
+
+
+def pragma(wrapper, name):
+    with wrapper.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.skipif(connection.vendor != 'sqlite', reason='только SQLite')
+@pytest.mark.django_db(transaction=True)
+class Test23Database:
+
+    def test_01_sqlite_pragmas(self, file_connection, settings):
+        assert pragma(file_connection, 'journal_mode') == 'wal', (
+            'Проверьте, что новое соединение с SQLite переводится в режим '
+            'WAL.'
+        )
+        assert pragma(file_connection, 'busy_timeout') == (
+            settings.SQLITE_PRAGMAS['busy_timeout']
+        ), 'Проверьте, что для SQLite задаётся busy_timeout.'
+        assert pragma(file_connection, 'synchronous') == 1
+
+    def test_02_broken_connection_is_closed(self, file_connection,
+                                            monkeypatch):
+        from api_yamdb.db import check_connections
+
+        file_connection.ensure_connection()
+        file_connection.settings_dict['CONN_MAX_AGE'] = 60
+        monkeypatch.setattr(connections, 'all', lambda: [file_connection])
+
+        check_connections()
+        assert file_connection.connection is not None
+
+        monkeypatch.setattr(file_connection, 'is_usable', lambda: False)
+        check_connections()
+        assert file_connection.connection is None, (
+            'Проверьте, что перед запросом разорванное постоянное '
+            'соединение закрывается.'
+        )
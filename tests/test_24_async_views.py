@@ -0,0 +1,52 @@
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24AsyncViews:
+
+    def test_01_async_routes_match_sync(self, admin_client, admin, client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client})
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        routes = (
+            'titles/',
+            f'titles/{title_id}/',
+            f'titles/{title_id}/reviews/',
+            f'titles/{title_id}/reviews/{review_id}/comments/',
+        )
+        for route in routes:
+            response = client.get(f'/api/v1/async/{route}')
+            assert response.status_code == HTTPStatus.OK
+            expected = client.get(f'/api/v1/{route}').json()
+            if 'results' in expected:
+                response_results = response.json()['results']
+                expected = expected['results']
+            else:
+                response_results = response.json()
+            assert response_results == expected, (
+                f'Проверьте, что `/api/v1/async/{route}` возвращает то же, '
+                f'что и `/api/v1/{route}`.'
+            )
+
+    def test_02_async_client(self, admin_client):
+        create_comments(admin_client, {})
+
+        async def fetch():
+            return await AsyncClient().get('/api/v1/async/titles/')
+
+        response = async_to_sync(fetch)()
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 2
+
+    def test_03_async_routes_are_read_only(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/async/titles/', data={'name': 'Чужой'})
+        assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED, (
+            'Проверьте, что асинхронные маршруты доступны только на чтение.'
+        )
@@ -0,0 +1,112 @@
+import re
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+from tests.utils import create_titles
+
+URL = '/api/v1/_metrics/'
+
+
+@pytest.fixture
+def metrics(settings):
+    from api.metrics import clear_metrics
+
+    settings.REQUEST_METRICS = {**settings.REQUEST_METRICS, 'ENABLED': True}
+    clear_metrics()
+    yield
+    clear_metrics()
+
+
+def timing(response, name):
+    match = re.search(rf'{name};dur=([\d.]+)', response['Server-Timing'])
+    assert match, (
+        f'Проверьте, что заголовок Server-Timing содержит метрику `{name}`.'
+    )
+    return float(match.group(1))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25Metrics:
+
+    def test_01_server_timing(self, metrics, admin_client):
+        create_titles(admin_client)
+        response = APIClient().get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK
+        assert 'desc="' in response['Server-Timing']
+        total = timing(response, 'total')
+        assert timing(response, 'db') <= total
+        assert 0 < timing(response, 'serializer') <= total, (
+            'Проверьте, что время сериализации попадает в Server-Timing.'
+        )
+
+    def test_02_metrics_endpoint(self, metrics, admin_client, user_client):
+        create_titles(admin_client)
+        client = APIClient()
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/')
+
+        assert client.get(URL).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(URL).status_code == HTTPStatus.FORBIDDEN
+        response = admin_client.get(URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('text/plain')
+        content = response.content.decode()
+        labels = 'view="titles-list",method="GET"'
+        assert (
+            f'yamdb_request_duration_seconds_count{{{labels}}} 2' in content
+        ), (
+            f'Проверьте, что `{URL}` отдаёт гистограмму времени запросов '
+            'по имени маршрута.'
+        )
+        assert f'yamdb_request_queries_bucket{{{labels},le="+Inf"}} 2' in (
+            content)
+        assert 'yamdb_request_sql_duration_seconds_sum' in content
+        assert 'yamdb_request_serializer_duration_seconds_sum' in content
+        assert (
+            'yamdb_response_cache_total{namespace="titles",result="hit"}'
+            in content
+        ), 'Проверьте, что в метрики попадает статистика кэша ответов.'
+
+    def test_03_async_view_queries(self, metrics, admin_client):
+        create_titles(admin_client)
+        response = APIClient().get('/api/v1/async/titles/')
+        assert response.status_code == HTTPStatus.OK
+        assert not response['Server-Timing'].startswith('db;dur=0.0;'), (
+            'Проверьте, что запросы асинхронных view попадают в метрики.'
+        )
+
+    def test_04_disabled(self, admin_client):
+        create_titles(admin_client)
+        response = APIClient().get('/api/v1/titles/')
+        assert not response.has_header('Server-Timing'), (
+            'Проверьте, что без REQUEST_METRICS middleware отключается.'
+        )
+
+    def test_05_asgi(self, metrics, admin_client):
+        import asyncio
+
+        from asgiref.sync import async_to_sync
+        from django.test import AsyncClient
+
+        from api.metrics import MetricsMiddleware
+
+        async def get_response(request):
+            pass
+
+        assert asyncio.iscoroutinefunction(MetricsMiddleware(get_response)), (
+            'Проверьте, что MetricsMiddleware работает в асинхронной цепочке '
+            'без переходов в синхронный поток.'
+        )
+        create_titles(admin_client)
+
+        async def get():
+            return await AsyncClient().get('/api/v1/titles/')
+
+        response = async_to_sync(get)()
+        assert response.status_code == HTTPStatus.OK
+        assert 'desc="0 queries"' not in response['Server-Timing'], (
+            'Проверьте, что под ASGI запросы синхронных view попадают в '
+            'метрики.'
+        )
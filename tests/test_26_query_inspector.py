@@ -0,0 +1,98 @@
+import logging
+
+import pytest
+from rest_framework.test import APIClient
+
+from tests.utils import create_titles
+
+
+@pytest.fixture
+def inspector(settings):
+    settings.QUERY_INSPECTOR = {
+        'ENABLED': True, 'SLOW_QUERY_MS': 10 ** 6, 'REPEAT_THRESHOLD': 2,
+    }
+
+
+def warnings(caplog):
+    return [
+        record.getMessage() for record in caplog.records
+        if record.name == 'api.queries' and record.levelno == logging.WARNING
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26QueryInspector:
+
+    def test_01_n_plus_one_is_logged(self, inspector, admin_client, caplog,
+                                     monkeypatch):
+        from api.views import TitleViewSet
+        from reviews.models import Title
+
+        create_titles(admin_client)
+        monkeypatch.setattr(TitleViewSet, 'queryset', Title.objects.all())
+        caplog.clear()
+        with caplog.at_level(logging.WARNING, logger='api.queries'):
+            APIClient().get('/api/v1/titles/')
+        messages = warnings(caplog)
+        for field in ('TitleGetSerializer.genre',
+                      'TitleGetSerializer.category'):
+            assert any(
+                'N+1' in message and field in message for message in messages
+            ), (
+                'Проверьте, что повторяющиеся запросы попадают в лог '
+                f'`api.queries` с полем сериализатора `{field}`.'
+            )
+        assert all('api/' in message for message in messages), (
+            'Проверьте, что в логе указано место в коде, откуда пришёл запрос.'
+        )
+
+    def test_02_no_warnings_with_prefetch(self, inspector, admin_client,
+                                          caplog):
+        create_titles(admin_client)
+        caplog.clear()
+        with caplog.at_level(logging.WARNING, logger='api.queries'):
+            APIClient().get('/api/v1/titles/')
+        assert warnings(caplog) == [], (
+            'Проверьте, что список произведений не делает запросов N+1.'
+        )
+
+    def test_03_slow_queries(self, inspector, settings, admin_client, caplog):
+        settings.QUERY_INSPECTOR = {**settings.QUERY_INSPECTOR,
+                                    'SLOW_QUERY_MS': 0}
+        create_titles(admin_client)
+        caplog.clear()
+        with caplog.at_level(logging.WARNING, logger='api.queries'):
+            APIClient().get('/api/v1/titles/')
+        assert any('Медленный запрос' in message
+                   for message in warnings(caplog)), (
+            'Проверьте, что запросы дольше SLOW_QUERY_MS попадают в лог.'
+        )
+
+    def test_04_asgi(self, inspector, admin_client, caplog, monkeypatch):
+        import asyncio
+
+        from asgiref.sync import async_to_sync
+        from django.test import AsyncClient
+
+        from api.inspector import QueryInspectorMiddleware
+        from api.views import TitleViewSet
+        from reviews.models import Title
+
+        async def get_response(request):
+            pass
+
+        assert asyncio.iscoroutinefunction(
+            QueryInspectorMiddleware(get_response)
+        ), 'Проверьте, что QueryInspectorMiddleware поддерживает ASGI.'
+        create_titles(admin_client)
+        monkeypatch.setattr(TitleViewSet, 'queryset', Title.objects.all())
+
+        async def get():
+            return await AsyncClient().get('/api/v1/titles/')
+
+        caplog.clear()
+        with caplog.at_level(logging.WARNING, logger='api.queries'):
+            async_to_sync(get)()
+        assert any('N+1' in message for message in warnings(caplog)), (
+            'Проверьте, что под ASGI повторяющиеся запросы попадают в лог.'
+        )
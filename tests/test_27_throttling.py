@@ -0,0 +1,87 @@
+from http import HTTPStatus
+
+import pytest
+
+URL_SIGNUP = '/api/v1/auth/signup/'
+URL_TOKEN = '/api/v1/auth/token/'
+
+
+@pytest.fixture
+def rates(settings):
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {'signup': '2/min', 'token': '3/min'},
+    }
+
+
+def signup(client, username, **extra):
+    return client.post(URL_SIGNUP, data={
+        'email': f'{username}@yamdb.fake', 'username': username
+    }, **extra)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27Throttling:
+
+    def test_01_signup_throttled_by_ip(self, rates, client,
+                                       django_user_model,
+                                       django_assert_num_queries):
+        assert signup(client, 'first').status_code == HTTPStatus.OK
+        assert signup(client, 'second').status_code == HTTPStatus.OK
+        with django_assert_num_queries(0):
+            response = signup(client, 'third')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что частые POST-запросы к `{URL_SIGNUP}` с одного '
+            'IP получают ответ 429 без обращения к базе.'
+        )
+        assert 1 <= int(response['Retry-After']) <= 60, (
+            'Проверьте, что ответ 429 содержит заголовок Retry-After.'
+        )
+        assert not django_user_model.objects.filter(
+            username='third').exists()
+
+    def test_02_signup_throttled_by_username(self, rates, client):
+        for idx in range(2):
+            response = signup(client, 'bot', REMOTE_ADDR=f'10.0.0.{idx}')
+            assert response.status_code == HTTPStatus.OK
+        response = signup(client, 'bot', REMOTE_ADDR='10.0.0.9')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что лимит на регистрацию считается и по username, '
+            'а не только по IP.'
+        )
+
+    def test_03_window_slides(self, rates, client, monkeypatch):
+        from api.throttling import SlidingWindowThrottle
+
+        now = 6000.0
+        monkeypatch.setattr(SlidingWindowThrottle, 'timer',
+                            staticmethod(lambda: now))
+        signup(client, 'first')
+        signup(client, 'second')
+        assert signup(client, 'third').status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS)
+
+        # В следующем окне запросы прошлого учитываются с весом 3/4:
+        # проходит один запрос, а не два.
+        now += 75
+        assert signup(client, 'third').status_code == HTTPStatus.OK
+        response = signup(client, 'fourth')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что запросы предыдущего окна учитываются '
+            'пропорционально.'
+        )
+        now += int(response['Retry-After'])
+        assert signup(client, 'fourth').status_code == HTTPStatus.OK, (
+            'Проверьте, что после Retry-After запрос снова проходит.'
+        )
+
+    def test_04_token_throttled(self, rates, client):
+        for _ in range(3):
+            response = client.post(URL_TOKEN, data={
+                'username': 'nobody', 'confirmation_code': '000000'
+            })
+            assert response.status_code == HTTPStatus.NOT_FOUND
+        response = client.post(URL_TOKEN, data={
+            'username': 'nobody', 'confirmation_code': '000000'
+        })
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
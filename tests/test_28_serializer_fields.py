@@ -0,0 +1,45 @@
+import pytest
+from rest_framework import serializers
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28SerializerFields:
+
+    def test_01_fields_built_once_per_class(self, monkeypatch):
+        from api.serializers import BaseModelSerializer, ReviewSerializer
+
+        calls = []
+        get_fields = serializers.ModelSerializer.get_fields
+
+        def counting_get_fields(self):
+            calls.append(type(self))
+            return get_fields(self)
+
+        monkeypatch.setattr(serializers.ModelSerializer, 'get_fields',
+                            counting_get_fields)
+        monkeypatch.setattr(BaseModelSerializer, '_fields_cache', {})
+        first, second = ReviewSerializer(), ReviewSerializer()
+        assert list(first.fields) == list(second.fields)
+        assert calls == [ReviewSerializer], (
+            'Проверьте, что поля ModelSerializer строятся один раз на класс.'
+        )
+        for name, field in first.fields.items():
+            assert field is not second.fields[name], (
+                'Проверьте, что каждый экземпляр сериализатора получает '
+                'собственные копии полей.'
+            )
+            assert field.parent is first
+
+    def test_02_output_unchanged(self, admin_client):
+        from api.serializers import TitleGetSerializer
+        from api.views import TitleViewSet
+        from tests.utils import create_titles
+
+        create_titles(admin_client)
+        titles = list(TitleViewSet.queryset.order_by('id'))
+        data = TitleGetSerializer(titles, many=True).data
+        assert data == TitleGetSerializer(titles, many=True).data
+        assert data[0]['category'] == {'name': 'Фильм', 'slug': 'films'}
+        assert sorted(genre['slug'] for genre in data[0]['genre']) == [
+            'comedy', 'horror'
+        ]
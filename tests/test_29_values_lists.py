@@ -0,0 +1,64 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29ValuesLists:
+
+    @pytest.mark.parametrize('url', ['/api/v1/genres/', '/api/v1/categories/'])
+    def test_01_list_matches_serializer(self, url, admin_client, client):
+        from api.serializers import CategorySerializer, GenreSerializer
+        from reviews.models import Category, Genre
+
+        create_genre(admin_client)
+        create_categories(admin_client)
+        if 'genres' in url:
+            expected = GenreSerializer(Genre.objects.all(), many=True).data
+        else:
+            expected = CategorySerializer(
+                Category.objects.all(), many=True).data
+
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'] == 'application/json'
+        assert response.json() == {
+            'count': len(expected), 'next': None, 'previous': None,
+            'results': [dict(item) for item in expected],
+        }, (
+            f'Проверьте, что быстрый список `{url}` совпадает с выводом '
+            'сериализатора.'
+        )
+        name = expected[0]['name']
+        response = client.get(url, {'search': name})
+        assert [item['name'] for item in response.json()['results']] == [
+            name
+        ]
+
+    def test_02_prerendered_for_authenticated(self, admin_client,
+                                              user_client,
+                                              django_assert_num_queries):
+        create_genre(admin_client)
+        first = user_client.get('/api/v1/genres/')
+        with django_assert_num_queries(0):
+            second = user_client.get('/api/v1/genres/')
+        assert second.content == first.content, (
+            'Проверьте, что готовый JSON списка жанров берётся из кэша и '
+            'для авторизованных пользователей.'
+        )
+
+    def test_03_writes_invalidate(self, admin_client, client):
+        create_genre(admin_client)
+        count = client.get('/api/v1/genres/').json()['count']
+
+        admin_client.post('/api/v1/genres/',
+                          data={'name': 'Мюзикл', 'slug': 'musical'})
+        response = client.get('/api/v1/genres/')
+        assert response.json()['count'] == count + 1, (
+            'Проверьте, что создание жанра сбрасывает кэш списка.'
+        )
+        admin_client.delete('/api/v1/genres/musical/')
+        assert client.get('/api/v1/genres/').json()['count'] == count
+